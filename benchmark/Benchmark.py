@@ -0,0 +1,112 @@
+﻿from __future__ import annotations
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+from benchmark.Cases import CASES
+
+BENCHMARK_FOLDER = os.path.dirname(__file__)
+HISTORY_FILE = os.path.join(BENCHMARK_FOLDER, "history.json")
+BASELINE_FILE = os.path.join(BENCHMARK_FOLDER, "baseline.json")
+# A case is a regression when it is this much slower than the baseline
+DEFAULT_THRESHOLD = 0.10
+
+
+def run_case(name: str, repeat: int = 5, min_time_s: float = 0.2) -> float:
+    """
+    :return: microseconds per call, the best of the repeats
+    """
+    timer = timeit.Timer(CASES[name]())
+    # autorange finds a number of calls taking at least 0.2 seconds
+    number, _ = timer.autorange()
+    number = max(1, round(number * min_time_s / 0.2))
+    return min(timer.repeat(repeat, number)) / number * 1_000_000
+
+
+def run_all(names: list[str] | None = None, repeat: int = 5, min_time_s: float = 0.2, log=print) -> dict[str, float]:
+    result: dict[str, float] = {}
+    for name in names or CASES:
+        result[name] = run_case(name, repeat, min_time_s)
+        log(f"{name}: {result[name]:.1f} us")
+    return result
+
+
+def compare(results: dict[str, float], baseline: dict[str, float],
+            threshold: float = DEFAULT_THRESHOLD) -> dict[str, float]:
+    """
+    :return: relative slowdown of every case slower than the baseline by more than the threshold
+    """
+    regressions: dict[str, float] = {}
+    for name, microseconds in results.items():
+        if name not in baseline:
+            continue
+        change = microseconds / baseline[name] - 1
+        if change > threshold:
+            regressions[name] = change
+    return regressions
+
+
+def load_json(file_path: str, default):
+    if not os.path.exists(file_path):
+        return default
+    with open(file_path) as f:
+        return json.load(f)
+
+
+def save_json(file_path: str, data) -> None:
+    with open(file_path, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def append_history(results: dict[str, float], file_path: str = HISTORY_FILE) -> None:
+    history = load_json(file_path, [])
+    history.append({
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _get_commit(),
+        "results": results,
+    })
+    save_json(file_path, history)
+
+
+def _get_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BENCHMARK_FOLDER, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Times the model hot paths and compares them with a baseline")
+    parser.add_argument("cases", nargs="*", help=f"cases to run, all by default: {', '.join(CASES)}")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per repeat")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD)
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the new baseline")
+    args = parser.parse_args()
+
+    results = run_all(args.cases, args.repeat, args.min_time)
+    append_history(results)
+
+    if args.save_baseline:
+        save_json(BASELINE_FILE, {**load_json(BASELINE_FILE, {}), **results})
+        print(f"Baseline saved to {BASELINE_FILE}")
+        sys.exit(0)
+
+    baseline = load_json(BASELINE_FILE, {})
+    if not baseline:
+        print(f"No baseline in {BASELINE_FILE}, run with --save-baseline")
+        sys.exit(0)
+
+    regressions = compare(results, baseline, args.threshold)
+    for name, microseconds in results.items():
+        if name in baseline:
+            flag = "  REGRESSION" if name in regressions else ""
+            print(f"{name}: {baseline[name]:.1f} -> {microseconds:.1f} us "
+                  f"({microseconds / baseline[name] - 1:+.1%}){flag}")
+    sys.exit(1 if regressions else 0)
@@ -0,0 +1,137 @@
+﻿from __future__ import annotations
+
+import os
+import random
+import tempfile
+from typing import Callable
+
+from src.model import Game, SaveParser
+from src.model.Perft import load_position
+from src.model.dataclasses import Position
+from src.view.PieceSprite import get_piece_sprites, get_sprite_changes
+
+# Same positions as the perft tool, so the numbers stay comparable between runs
+POSITIONS = ("initial", "midgame.txt", "kings.txt", "jumps.txt")
+SEED = 0
+
+
+def _load_games() -> list[Game]:
+    return [load_position(name) for name in POSITIONS]
+
+
+def _random_position_pairs(count: int) -> list[tuple[Position, Position]]:
+    rng = random.Random(SEED)
+    return [(Position.at(rng.randrange(8), rng.randrange(8)), Position.at(rng.randrange(8), rng.randrange(8)))
+            for _ in range(count)]
+
+
+def is_move_valid() -> Callable[[], None]:
+    games = _load_games()
+    pairs = _random_position_pairs(64)
+
+    def run():
+        for game in games:
+            for from_position, to_position in pairs:
+                game.is_move_valid(from_position, to_position)
+    return run
+
+
+def get_valid_moves() -> Callable[[], None]:
+    games = _load_games()
+
+    def run():
+        for game in games:
+            for piece in game.board.get_pieces(game.side_to_move):
+                game.get_valid_moves(piece)
+    return run
+
+
+def get_all_valid_moves() -> Callable[[], None]:
+    games = _load_games()
+
+    def run():
+        for game in games:
+            game.get_all_valid_moves(game.side_to_move)
+    return run
+
+
+def get_best_move() -> Callable[[], None]:
+    games = _load_games()
+    moves = [game.get_all_valid_moves(game.side_to_move) for game in games]
+
+    def run():
+        # get_best_move breaks ties at random
+        random.seed(SEED)
+        for game, game_moves in zip(games, moves):
+            game.get_best_move(game_moves)
+    return run
+
+
+def get_winner() -> Callable[[], None]:
+    games = _load_games()
+
+    def run():
+        for game in games:
+            game.get_winner()
+    return run
+
+
+def get_pieces() -> Callable[[], None]:
+    games = _load_games()
+
+    def run():
+        for game in games:
+            game.board.get_pieces(game.side_to_move)
+            game.board.get_pieces(game.side_to_move.get_enemy())
+    return run
+
+
+def save_load() -> Callable[[], None]:
+    games = _load_games()
+    file_path = os.path.join(tempfile.gettempdir(), "checkers_benchmark_save.txt")
+
+    def run():
+        for game in games:
+            SaveParser.save(game.board, game.side_to_move, None, 0, file_path)
+            SaveParser.load(file_path)
+    return run
+
+
+def piece_sprites() -> Callable[[], None]:
+    games = _load_games()
+
+    def run():
+        for game in games:
+            get_piece_sprites(game.board)
+    return run
+
+
+def sprite_changes() -> Callable[[], None]:
+    # Sprites before and after every move of the saved games, like draw_pieces during a replay
+    sprite_pairs = []
+    for game in _load_games():
+        before = {sprite.position: sprite for sprite in get_piece_sprites(game.board)}
+        for move in game.get_all_valid_moves(game.side_to_move):
+            game.make(move)
+            after = {sprite.position: sprite for sprite in get_piece_sprites(game.board)}
+            game.unmake()
+            sprite_pairs.append((before, after))
+
+    def run():
+        for before, after in sprite_pairs:
+            get_sprite_changes(before, after)
+    return run
+
+
+# Name -> setup returning the function to time, the setup itself isn't timed
+CASES: dict[str, Callable[[], Callable[[], None]]] = {
+    "Game.is_move_valid": is_move_valid,
+    "Game.get_valid_moves": get_valid_moves,
+    "Game.get_all_valid_moves": get_all_valid_moves,
+    "Game.get_best_move": get_best_move,
+    "Game.get_winner": get_winner,
+    "Board.get_pieces": get_pieces,
+    "SaveParser.save/load": save_load,
+    "PieceSprite.get_piece_sprites": piece_sprites,
+    "PieceSprite.get_sprite_changes": sprite_changes,
+}
@@ -1,4 +1,5 @@
-﻿import sys
+﻿import logging
+import sys
 
 from src.controller import GameController
 from src.model import Game
@@ -13,5 +14,7 @@ def get_ai_opponent_arg():
 
 
 if __name__ == '__main__':
+    # AI move stats are logged as JSON lines
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
     controller = GameController(Game(), MainWindow(), ai_opponent=get_ai_opponent_arg())
     controller.start()
@@ -1,3 +1,12 @@
-﻿from src.controller.GameController import GameController
-from src.view.MainWindow import MainWindow
-from src.model.Game import Game
+﻿from src.model.Game import Game
+
+
+def __getattr__(name: str):
+    # The controller and the window need Tk, they are imported on first use so the model works without it
+    if name == "GameController":
+        from src.controller.GameController import GameController
+        return GameController
+    if name == "MainWindow":
+        from src.view.MainWindow import MainWindow
+        return MainWindow
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
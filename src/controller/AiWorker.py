@@ -0,0 +1,68 @@
+﻿from __future__ import annotations
+
+import queue
+import threading
+from typing import NamedTuple
+
+from src.model import Game
+from src.model.dataclasses import Position, SearchResult, SearchStats
+
+
+class AiProgress(NamedTuple):
+    # Best move of the deepest finished search so far
+    from_position: Position
+    to_position: Position
+    depth: int
+
+
+class AiResult(NamedTuple):
+    # None if the AI has no valid move
+    from_position: Position | None
+    to_position: Position | None
+    stats: SearchStats | None
+
+
+class AiWorker:
+    """
+    Finds the AI move of a snapshot of the game in a background thread, so the Tk event loop keeps running.
+    AiProgress and finally one AiResult are put into the messages queue, the controller polls it with after.
+    """
+
+    def __init__(self, game: Game):
+        # Positions are handed over instead of Move objects, those belong to the snapshot's pieces
+        self._snapshot = Game.from_position(game.get_position())
+        self._snapshot.engine = game.engine
+        self._snapshot.opening_book = game.opening_book
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self.messages: queue.Queue[AiProgress | AiResult] = queue.Queue()
+
+    @property
+    def is_cancelled(self) -> bool:
+        return self._stop_event.is_set()
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def cancel(self) -> None:
+        """
+        Stops the search and waits for the thread, so the engine is free for the next search right away
+        """
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    # region Private methods
+
+    def _run(self) -> None:
+        move, stats = self._snapshot.find_best_move(self._stop_event, self._on_progress)
+        if move is None:
+            self.messages.put(AiResult(None, None, stats))
+        else:
+            self.messages.put(AiResult(move.from_piece.position, move.to_position, stats))
+
+    def _on_progress(self, result: SearchResult) -> None:
+        if result.move is not None:
+            self.messages.put(AiProgress(result.move.from_piece.position, result.move.to_position, result.depth))
+
+    # endregion Private methods
@@ -1,18 +1,39 @@
 ﻿from __future__ import annotations
 
-from src.model import Game, SaveParser, SaveResult
+import logging
+import os
+
+from src.controller.AiWorker import AiProgress, AiResult, AiWorker
+from src.controller.Ponderer import Ponderer
+from src.model import Game, OpeningBook, SaveParser, SaveResult, Tablebase
 from src.model.dataclasses import Position
 from src.view import MainWindow, SideWindow
 
+logger = logging.getLogger(__name__)
+
 
 class GameController:
     AI_MOVE_DELAY_MS = 500
+    # How often the event loop checks the AI worker for progress and its move
+    AI_POLL_MS = 50
+    # Logs the SearchStats of every AI move as a JSON line
+    LOG_AI_STATS = True
+    # Searches the AI replies while the human thinks
+    PONDER = True
 
     def __init__(self, checkers: Game, view: MainWindow, ai_opponent: bool):
         self.game = checkers
         self.view = view
         self.is_ai_opponent = ai_opponent
+        # Empty if no tables were generated into Tablebase.DEFAULT_FOLDER
+        self.tablebase = Tablebase()
+        self.opening_book = OpeningBook() if os.path.exists(OpeningBook.DEFAULT_FILE) else None
+        self._ai_worker: AiWorker | None = None
+        self._ponderer: Ponderer | None = None
+        # Pondered reply to the human's last move, made instead of searching
+        self._pondered_result: AiResult | None = None
         SaveParser.create_saves_folder()
+        self._setup_ai()
 
     def start(self):
         self.view.setup(self)
@@ -51,6 +72,7 @@ class GameController:
             self.view.show_error("Invalid save file (.. or bug)")
             return
 
+        self._cancel_ai_move()
         self.game.load_save_state(save)
         self.is_ai_opponent = self.game.ai_side is not None
 
@@ -58,7 +80,9 @@ class GameController:
         self.view.draw_pieces(self.game.board)
 
     def restart(self):
+        self._cancel_ai_move()
         self.game = Game()
+        self._setup_ai()
         if self.is_ai_opponent:
             self._choose_side()
 
@@ -76,6 +100,13 @@ class GameController:
 
     # region Private methods
 
+    def _setup_ai(self):
+        if self.game.engine is not None:
+            self.game.engine.tablebase = self.tablebase
+            self.game.engine.collect_stats = self.LOG_AI_STATS
+        self.game.opening_book = self.opening_book
+        self.game.tablebase = self.tablebase
+
     def _choose_side(self):
         window = SideWindow()
         side = window.wait_for_result()
@@ -98,17 +129,99 @@ class GameController:
                 self.view.highlight_piece(click_position)
         # Some piece is selected => try to move it to the clicked position
         else:
+            from_position = self.game.board.selected.position
             self.game.make_move(click_position)
             self.view.draw_pieces(self.game.board)
 
             # AI's turn
+            if self.game.is_ai_turn():
+                self._pondered_result = self._stop_pondering(from_position, click_position)
             self._make_ai_move_delayed()
 
     def _make_ai_move(self):
-        if not self.game.is_ai_turn():
+        if not self.game.is_ai_turn() or self._ai_worker is not None:
+            return
+
+        if self._pondered_result is not None:
+            result, self._pondered_result = self._pondered_result, None
+            self._finish_ai_move(result)
+            return
+
+        self._ai_worker = AiWorker(self.game)
+        self._ai_worker.start()
+        self.view.after(self.AI_POLL_MS, self._poll_ai_worker, self._ai_worker)
+
+    def _poll_ai_worker(self, worker: AiWorker):
+        # Cancelled by Restart or Load in the meantime
+        if worker is not self._ai_worker:
+            return
+
+        while not worker.messages.empty():
+            message = worker.messages.get()
+            if isinstance(message, AiProgress):
+                self.view.show_ai_progress(message.from_position, message.to_position, message.depth)
+            elif isinstance(message, AiResult):
+                self._finish_ai_move(message)
+                return
+
+        self.view.after(self.AI_POLL_MS, self._poll_ai_worker, worker)
+
+    def _finish_ai_move(self, result: AiResult):
+        self._ai_worker = None
+        self.view.clear_ai_progress()
+
+        move = None
+        if result.from_position is not None:
+            move = self.game.find_move(result.from_position, result.to_position)
+            # Result of another position, e.g. a pondered reply that doesn't fit anymore
+            if move is None:
+                logger.warning("AI move %s -> %s is not valid in the current position, searching again",
+                               result.from_position, result.to_position)
+                self._make_ai_move()
+                return
+
+        if result.stats is not None:
+            logger.info(result.stats.to_log_line())
+
+        # No valid moves => opponent wins
+        if move is None:
             return
 
-        self.game.make_best_move()
+        self.game.apply_move(move)
         self.view.draw_pieces(self.game.board)
 
+        winner_side = self.game.get_winner()
+        if winner_side is not None:
+            self.view.show_winner(winner_side, self.game.get_game_time_seconds())
+            return
+
+        if self.PONDER and self.game.engine is not None:
+            self._ponderer = Ponderer(self.game)
+            self._ponderer.start()
+
+    def _stop_pondering(self, from_position: Position, to_position: Position) -> AiResult | None:
+        """
+        :return: the pondered AI reply to the human move, None if it wasn't searched fully
+        """
+        if self._ponderer is None:
+            return None
+
+        self._ponderer.stop()
+        result = self._ponderer.get_result(from_position, to_position)
+        self._ponderer = None
+        return result
+
+    def _cancel_ai_move(self):
+        if self._ponderer is not None:
+            self._ponderer.stop()
+            self._ponderer = None
+        self._pondered_result = None
+
+        if self._ai_worker is None:
+            return
+
+        self._ai_worker.cancel()
+        self._ai_worker = None
+        self.view.clear_ai_progress()
+
     # endregion Private methods
@@ -0,0 +1,83 @@
+﻿from __future__ import annotations
+
+import dataclasses
+import threading
+
+from src.controller.AiWorker import AiResult
+from src.model import Game
+from src.model.dataclasses import Position
+
+
+class Ponderer:
+    """
+    Searches the AI replies to the human's moves in a background thread while the human thinks.
+    The most likely human move (the hash move of the position) is searched first, then the rest in move order.
+    The engine is shared with the game, so a reply that wasn't finished in time still finds its
+    transposition table filled.
+    """
+
+    def __init__(self, game: Game):
+        self._position = game.get_position()
+        self._engine = game.engine
+        self._opening_book = game.opening_book
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._lock = threading.Lock()
+        # Human move (from position, to position) -> AI reply found for it
+        self._results: dict[tuple[Position, Position], AiResult] = {}
+
+    @property
+    def pondered_count(self) -> int:
+        with self._lock:
+            return len(self._results)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops pondering and waits for the thread, so the engine is free for the AI move right away
+        """
+        self._stop_event.set()
+        if self._thread.is_alive():
+            self._thread.join()
+
+    def get_result(self, from_position: Position, to_position: Position) -> AiResult | None:
+        """
+        :return: the AI reply to the human move, None if it wasn't pondered fully
+        """
+        with self._lock:
+            return self._results.get((from_position, to_position))
+
+    # region Private methods
+
+    def _run(self) -> None:
+        for human_move in self._get_likely_moves():
+            game = Game.from_position(self._position)
+            game.engine = self._engine
+            game.opening_book = self._opening_book
+            game.make(game.find_move(*human_move))
+
+            move, stats = game.find_best_move(self._stop_event)
+            # Interrupted searches are discarded, only their table entries are kept
+            if self._stop_event.is_set():
+                return
+
+            # Book moves keep their source
+            if stats is not None and stats.source == "engine":
+                stats = dataclasses.replace(stats, source="ponder")
+            with self._lock:
+                if move is None:
+                    self._results[human_move] = AiResult(None, None, stats)
+                else:
+                    self._results[human_move] = AiResult(move.from_piece.position, move.to_position, stats)
+
+    def _get_likely_moves(self) -> list[tuple[Position, Position]]:
+        game = Game.from_position(self._position)
+        entry = self._engine.table.probe(game.zobrist_key)
+        hash_move = entry.best_move if entry is not None else None
+
+        moves = self._engine.move_orderer.order(game.get_all_valid_moves(game.side_to_move), 0, hash_move)
+        return [(move.from_piece.position, move.to_position) for move in moves]
+
+    # endregion Private methods
@@ -1 +1,3 @@
-﻿from .GameController import GameController
+﻿from .AiWorker import AiWorker, AiProgress, AiResult
+from .Ponderer import Ponderer
+from .GameController import GameController
@@ -0,0 +1,118 @@
+﻿from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from src.model import MoveTables
+from src.model.BitBoard import BitBoard, SQUARE_COUNT, square_index, square_position
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses import EvaluationWeights, Position, Side
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+if TYPE_CHECKING:
+    from src.model import Game
+
+EMPTY = 0
+BLACK_MAN = 1
+BLACK_KING = 2
+WHITE_MAN = -1
+WHITE_KING = -2
+
+
+def encode_game(game: Game) -> list[int]:
+    """
+    :return: piece code of every dark field, bit order of BitBoard
+    """
+    result = [EMPTY] * SQUARE_COUNT
+    for side, man, king in ((Side.BLACK, BLACK_MAN, BLACK_KING), (Side.WHITE, WHITE_MAN, WHITE_KING)):
+        for piece in game.board.get_pieces(side):
+            result[square_index(piece.position)] = king if piece.is_king else man
+    return result
+
+
+class BatchEvaluator:
+    """
+    Same evaluation as Engine.evaluate, vectorized over an (N, 32) int8 array of positions encoded like encode_game.
+    Needs numpy.
+    """
+
+    def __init__(self, weights: EvaluationWeights | None = None):
+        if numpy is None:
+            raise ImportError("BatchEvaluator needs numpy")
+
+        self.weights = weights or EvaluationWeights()
+        rows = numpy.array([square_position(square).row for square in range(SQUARE_COUNT)])
+
+        # Value of every piece code (shifted by 2 to index from 0) on every field, from black's point of view
+        black_men = self.weights.man + self.weights.advancement * rows + self.weights.back_rank * (rows == 0)
+        white_men = self.weights.man + self.weights.advancement * (BOARD_SIZE - 1 - rows) + \
+            self.weights.back_rank * (rows == BOARD_SIZE - 1)
+        kings = numpy.full(SQUARE_COUNT, self.weights.king)
+        self._values = numpy.stack([-kings, -white_men, numpy.zeros(SQUARE_COUNT, dtype=int), black_men, kings])
+        self._squares = numpy.arange(SQUARE_COUNT)
+
+        # Per direction: field one step away (SQUARE_COUNT, a padding column, when off the board) and the row step
+        self._steps = [(numpy.array([self._get_neighbour(square, row_step, column_step)
+                                     for square in range(SQUARE_COUNT)]), row_step)
+                       for row_step, column_step in ((1, 1), (1, -1), (-1, 1), (-1, -1))]
+
+    @staticmethod
+    def encode_bit_boards(bit_boards: list[BitBoard]):
+        """
+        :return: (N, 32) int8 array of the positions
+        """
+        masks = numpy.array([(bit_board.black, bit_board.white, bit_board.kings) for bit_board in bit_boards],
+                            dtype=numpy.uint32).reshape(-1, 3)
+        bits = (masks[:, :, None] >> numpy.arange(SQUARE_COUNT, dtype=numpy.uint32)) & 1
+        black, white, kings = bits[:, 0].astype(numpy.int8), bits[:, 1].astype(numpy.int8), bits[:, 2].astype(numpy.int8)
+        return (black - white) * (1 + kings)
+
+    @staticmethod
+    def encode_games(games: list[Game]):
+        return numpy.array([encode_game(game) for game in games], dtype=numpy.int8).reshape(-1, SQUARE_COUNT)
+
+    def evaluate(self, positions, side: Side = Side.BLACK):
+        """
+        :param positions: (N, 32) array of piece codes
+        :param side: point of view of the scores
+        :return: N scores
+        """
+        positions = numpy.asarray(positions, dtype=numpy.int8)
+        scores = self._values[positions + 2, self._squares].sum(axis=1)
+
+        if self.weights.mobility:
+            scores += self.weights.mobility * self._get_mobility(positions)
+
+        return scores if side == Side.BLACK else -scores
+
+    # region Private methods
+
+    @staticmethod
+    def _get_neighbour(square: int, row_step: int, column_step: int) -> int:
+        position = square_position(square)
+        row, column = position.row + row_step, position.column + column_step
+        if 0 <= row < BOARD_SIZE and 0 <= column < BOARD_SIZE:
+            return square_index(Position.at(row, column))
+        return SQUARE_COUNT
+
+    def _get_mobility(self, positions):
+        """
+        :return: simple steps of black minus simple steps of white, jumps are not counted
+        """
+        padded = numpy.pad(positions, ((0, 0), (0, 1)), constant_values=WHITE_KING)
+        black_kings, white_kings = positions == BLACK_KING, positions == WHITE_KING
+        black_movers = black_kings | (positions == BLACK_MAN)
+        white_movers = white_kings | (positions == WHITE_MAN)
+
+        result = numpy.zeros(len(positions), dtype=numpy.int64)
+        for neighbours, row_step in self._steps:
+            empty = padded[:, neighbours] == EMPTY
+            black = black_movers if row_step == MoveTables.get_forward_row_step(Side.BLACK) else black_kings
+            white = white_movers if row_step == MoveTables.get_forward_row_step(Side.WHITE) else white_kings
+            result += (black & empty).sum(axis=1) - (white & empty).sum(axis=1)
+        return result
+
+    # endregion Private methods
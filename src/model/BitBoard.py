@@ -0,0 +1,218 @@
+﻿from __future__ import annotations
+
+from typing import NamedTuple
+
+from src.model import Board
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses import Position, Piece, Side
+
+# Only the dark fields are playable, each one gets a bit
+ROW_SQUARES = BOARD_SIZE // 2
+SQUARE_COUNT = BOARD_SIZE * ROW_SQUARES
+FULL_MASK = (1 << SQUARE_COUNT) - 1
+
+
+def square_index(position: Position) -> int:
+    return position.row * ROW_SQUARES + position.column // 2
+
+
+def square_position(square: int) -> Position:
+    row = square // ROW_SQUARES
+    column = (square % ROW_SQUARES) * 2 + (1 if row % 2 == 0 else 0)
+    return Position.at(row, column)
+
+
+def _rows_mask(rows) -> int:
+    mask = 0
+    for row in rows:
+        mask |= ((1 << ROW_SQUARES) - 1) << (row * ROW_SQUARES)
+    return mask
+
+
+EVEN_ROWS = _rows_mask(range(0, BOARD_SIZE, 2))
+ODD_ROWS = _rows_mask(range(1, BOARD_SIZE, 2))
+TOP_ROW = _rows_mask([0])
+BOTTOM_ROW = _rows_mask([BOARD_SIZE - 1])
+# Dark fields of the first column are on odd rows, the last column on even rows
+LEFT_COLUMN = sum(1 << (row * ROW_SQUARES) for row in range(1, BOARD_SIZE, 2))
+RIGHT_COLUMN = sum(1 << (row * ROW_SQUARES + ROW_SQUARES - 1) for row in range(0, BOARD_SIZE, 2))
+
+# (shift from an even row, shift from an odd row, fields the step can start from)
+DOWN_RIGHT = (ROW_SQUARES + 1, ROW_SQUARES, FULL_MASK & ~BOTTOM_ROW & ~RIGHT_COLUMN)
+DOWN_LEFT = (ROW_SQUARES, ROW_SQUARES - 1, FULL_MASK & ~BOTTOM_ROW & ~LEFT_COLUMN)
+UP_RIGHT = (-(ROW_SQUARES - 1), -ROW_SQUARES, FULL_MASK & ~TOP_ROW & ~RIGHT_COLUMN)
+UP_LEFT = (-ROW_SQUARES, -(ROW_SQUARES + 1), FULL_MASK & ~TOP_ROW & ~LEFT_COLUMN)
+
+# Same order as Piece.get_possible_moves, so chains ending on the same field resolve the same way
+KING_DIRECTIONS = (DOWN_RIGHT, DOWN_LEFT, UP_RIGHT, UP_LEFT)
+WHITE_DIRECTIONS = (UP_RIGHT, UP_LEFT)
+BLACK_DIRECTIONS = (DOWN_RIGHT, DOWN_LEFT)
+OPPOSITE_DIRECTIONS = {
+    DOWN_RIGHT: UP_LEFT,
+    DOWN_LEFT: UP_RIGHT,
+    UP_RIGHT: DOWN_LEFT,
+    UP_LEFT: DOWN_RIGHT,
+}
+
+
+def _shift(bits: int, shift: int) -> int:
+    return bits << shift if shift > 0 else bits >> -shift
+
+
+def step(bits: int, direction: tuple[int, int, int]) -> int:
+    """
+    :return: all fields one diagonal step away from the given fields in the given direction
+    """
+    even_shift, odd_shift, source_mask = direction
+    bits &= source_mask
+    return _shift(bits & EVEN_ROWS, even_shift) | _shift(bits & ODD_ROWS, odd_shift)
+
+
+def iter_bits(bits: int):
+    while bits:
+        bit = bits & -bits
+        yield bit
+        bits ^= bit
+
+
+class BitMove(NamedTuple):
+    from_square: int
+    to_square: int
+    # Mask of the jumped enemy pieces
+    captured: int = 0
+
+
+class BitBoard:
+    """
+    Board stored as 32-bit masks over the dark fields, bit n is the field square_position(n)
+    """
+    __slots__ = ("black", "white", "kings", "side_to_move")
+
+    def __init__(self, black: int = 0, white: int = 0, kings: int = 0, side_to_move: Side = Side.BLACK):
+        self.black = black
+        self.white = white
+        self.kings = kings
+        self.side_to_move = side_to_move
+
+    @staticmethod
+    def from_board(board: Board, side_to_move: Side) -> BitBoard:
+        result = BitBoard(side_to_move=side_to_move)
+        for side in (Side.BLACK, Side.WHITE):
+            for piece in board.get_pieces(side):
+                bit = 1 << square_index(piece.position)
+                if side == Side.BLACK:
+                    result.black |= bit
+                else:
+                    result.white |= bit
+                if piece.is_king:
+                    result.kings |= bit
+        return result
+
+    @staticmethod
+    def from_game(game) -> BitBoard:
+        return BitBoard.from_board(game.board, game.side_to_move)
+
+    def to_board(self) -> Board:
+        board = Board()
+        for side, pieces in ((Side.BLACK, self.black), (Side.WHITE, self.white)):
+            for bit in iter_bits(pieces):
+                square = bit.bit_length() - 1
+                board.set_piece(Piece(side, square_position(square), bool(self.kings & bit)))
+        return board
+
+    def encode(self) -> tuple[int, int, int, int]:
+        """
+        :return: compact form of the position, cheap to send to other processes
+        """
+        return self.black, self.white, self.kings, self.side_to_move.value
+
+    @staticmethod
+    def decode(position: tuple[int, int, int, int]) -> BitBoard:
+        black, white, kings, side_to_move = position
+        return BitBoard(black, white, kings, Side(side_to_move))
+
+    def get_pieces(self, side: Side) -> int:
+        return self.black if side == Side.BLACK else self.white
+
+    def get_all_valid_moves(self, side: Side) -> list[BitMove]:
+        """
+        Same moves as Game.get_all_valid_moves: simple steps and every prefix of every jump chain,
+        one move per piece and landing field
+        """
+        result: list[BitMove] = []
+
+        own = self.get_pieces(side)
+        enemy = self.get_pieces(side.get_enemy())
+        empty = FULL_MASK & ~(self.black | self.white)
+        men = own & ~self.kings
+        kings = own & self.kings
+        men_directions = BLACK_DIRECTIONS if side == Side.BLACK else WHITE_DIRECTIONS
+
+        # Simple moves for all pieces at once, one shift per direction
+        for direction in KING_DIRECTIONS:
+            movers = kings | men if direction in men_directions else kings
+            targets = step(movers, direction) & empty
+            back = OPPOSITE_DIRECTIONS[direction]
+            for target in iter_bits(targets):
+                source = step(target, back)
+                result.append(BitMove(source.bit_length() - 1, target.bit_length() - 1))
+
+        # Pieces with at least one jump, the chains are expanded per piece
+        jumpers = 0
+        for direction in KING_DIRECTIONS:
+            movers = kings | men if direction in men_directions else kings
+            landings = step(step(movers, direction) & enemy, direction) & empty
+            back = OPPOSITE_DIRECTIONS[direction]
+            jumpers |= step(step(landings, back), back)
+
+        for piece in iter_bits(jumpers):
+            directions = KING_DIRECTIONS if piece & kings else men_directions
+            moves: dict[int, BitMove] = {}
+            self._expand_jumps(piece, piece, directions, enemy, empty | piece, 0, moves)
+            result += moves.values()
+
+        return result
+
+    def _expand_jumps(self, origin: int, current: int, directions, enemy: int, empty: int, captured: int,
+                      moves: dict[int, BitMove]) -> None:
+        for direction in directions:
+            jumped = step(current, direction) & enemy & ~captured
+            if not jumped:
+                continue
+            landing = step(jumped, direction) & empty
+            if not landing:
+                continue
+
+            moves[landing] = BitMove(origin.bit_length() - 1, landing.bit_length() - 1, captured | jumped)
+            self._expand_jumps(origin, landing, directions, enemy, empty, captured | jumped, moves)
+
+    def apply_move(self, move: BitMove) -> BitBoard:
+        """
+        :return: new board with the move made and the other side to move
+        """
+        from_bit = 1 << move.from_square
+        to_bit = 1 << move.to_square
+        black, white, kings = self.black, self.white, self.kings
+
+        if black & from_bit:
+            black = (black ^ from_bit) | to_bit
+            white &= ~move.captured
+            promotion_row = BOTTOM_ROW
+        else:
+            white = (white ^ from_bit) | to_bit
+            black &= ~move.captured
+            promotion_row = TOP_ROW
+
+        kings &= ~move.captured
+        if kings & from_bit or to_bit & promotion_row:
+            kings = (kings & ~from_bit) | to_bit
+
+        return BitBoard(black, white, kings, self.side_to_move.get_enemy())
+
+    def __eq__(self, other):
+        return isinstance(other, BitBoard) and \
+            (self.black, self.white, self.kings, self.side_to_move) == \
+            (other.black, other.white, other.kings, other.side_to_move)
+
+    def __hash__(self):
+        return hash((self.black, self.white, self.kings, self.side_to_move))
@@ -1,5 +1,6 @@
 ﻿from __future__ import annotations
 
+from src.model import MoveTables, Zobrist
 from src.model.constants import BOARD_SIZE
 from src.model.dataclasses import Position, Piece, Side
 
@@ -8,6 +9,13 @@ class Board:
 
     def __init__(self):
         self._board: dict[Position, Piece | None] = {}
+        # Index of the same pieces by side, so per-side queries never touch the other side
+        self._side_pieces: dict[Side, dict[Position, Piece]] = {Side.WHITE: {}, Side.BLACK: {}}
+        self._king_counts: dict[Side, int] = {Side.WHITE: 0, Side.BLACK: 0}
+        self._zobrist_key = 0
+        # Jumps possible right now (indices of MoveTables.JUMP_LINES) and who can jump the piece on a position
+        self._active_jump_lines: set[int] = set()
+        self._attackers: dict[Position, set[Position]] = {}
         self.selected: Piece | None = None
 
     def set_initial_positions(self):
@@ -17,22 +25,57 @@ class Board:
         for row in range(ONE_SIDE_ROWS):
             for column in range(BOARD_SIZE):
                 if (row + column) % 2 == 1:
-                    position = Position(row, column)
-                    self._board[position] = Piece(Side.BLACK, position)
+                    position = Position.at(row, column)
+                    self.set_piece(Piece(Side.BLACK, position))
 
         # Place white pieces
         for row in range(BOARD_SIZE - ONE_SIDE_ROWS, BOARD_SIZE):
             for column in range(BOARD_SIZE):
                 if (row + column) % 2 == 1:
-                    position = Position(row, column)
-                    self._board[position] = Piece(Side.WHITE, position)
+                    position = Position.at(row, column)
+                    self.set_piece(Piece(Side.WHITE, position))
 
     def delete_piece(self, piece: Piece) -> None:
         if piece.position in self._board:
-            del self._board[piece.position]
+            self._remove_from_index(self._board.pop(piece.position))
+            self._update_attacks(piece.position)
 
     def set_piece(self, piece: Piece) -> None:
+        replaced_piece = self._board.get(piece.position)
+        if replaced_piece is not None:
+            self._remove_from_index(replaced_piece)
+
         self._board[piece.position] = piece
+        self._side_pieces[piece.side][piece.position] = piece
+        self._zobrist_key ^= Zobrist.get_piece_key(piece)
+        if piece.is_king:
+            self._king_counts[piece.side] += 1
+
+        self._update_attacks(piece.position)
+
+    def set_king(self, piece: Piece, is_king: bool) -> None:
+        """
+        Crowns or uncrowns the piece, use this instead of setting is_king to keep the king counts and the zobrist key right
+        """
+        if piece.is_king == is_king:
+            return
+
+        if self._board.get(piece.position) is not piece:
+            piece.is_king = is_king
+            return
+
+        self._king_counts[piece.side] += 1 if is_king else -1
+        self._zobrist_key ^= Zobrist.get_piece_key(piece)
+        piece.is_king = is_king
+        self._zobrist_key ^= Zobrist.get_piece_key(piece)
+        self._update_attacks(piece.position)
+
+    @property
+    def zobrist_key(self) -> int:
+        """
+        64-bit key of the piece placement, kept up to date on every change
+        """
+        return self._zobrist_key
 
     def update_piece_position(self, piece: Piece, position: Position) -> None:
         self.delete_piece(piece)
@@ -54,7 +97,67 @@ class Board:
         row = (position1.row + position2.row) // 2
         column = (position1.column + position2.column) // 2
 
-        return self.get_piece(Position(row, column))
+        return self.get_piece(Position.at(row, column))
 
     def get_pieces(self, side: Side) -> list[Piece]:
-        return [piece for piece in self._board.values() if piece.side == side]
+        return list(self._side_pieces[side].values())
+
+    def count_pieces(self, side: Side) -> int:
+        return len(self._side_pieces[side])
+
+    def count_kings(self, side: Side) -> int:
+        return self._king_counts[side]
+
+    def get_attackers(self, position: Position) -> list[Piece]:
+        """
+        :return: enemy pieces that can jump over the piece on the given position right now
+        """
+        return [self._board[attacker_position] for attacker_position in self._attackers.get(position, ())]
+
+    def is_attacked(self, position: Position) -> bool:
+        return bool(self._attackers.get(position))
+
+    # region Private methods
+
+    def _update_attacks(self, position: Position) -> None:
+        """
+        Re-checks only the jumps the changed position takes part in
+        """
+        for line in MoveTables.LINES_THROUGH.get(position, ()):
+            is_active = self._is_jump_possible(line)
+            if is_active == (line in self._active_jump_lines):
+                continue
+
+            attacker_position, jumped_position, _, _ = MoveTables.JUMP_LINES[line]
+            if is_active:
+                self._active_jump_lines.add(line)
+                self._attackers.setdefault(jumped_position, set()).add(attacker_position)
+            else:
+                self._active_jump_lines.remove(line)
+                attackers = self._attackers[jumped_position]
+                attackers.remove(attacker_position)
+                if not attackers:
+                    del self._attackers[jumped_position]
+
+    def _is_jump_possible(self, line: int) -> bool:
+        attacker_position, jumped_position, landing_position, row_step = MoveTables.JUMP_LINES[line]
+
+        attacker = self._board.get(attacker_position)
+        if attacker is None:
+            return False
+        if not attacker.is_king and row_step != MoveTables.get_forward_row_step(attacker.side):
+            return False
+
+        jumped_piece = self._board.get(jumped_position)
+        if jumped_piece is None or jumped_piece.side == attacker.side:
+            return False
+
+        return landing_position not in self._board
+
+    def _remove_from_index(self, piece: Piece) -> None:
+        del self._side_pieces[piece.side][piece.position]
+        self._zobrist_key ^= Zobrist.get_piece_key(piece)
+        if piece.is_king:
+            self._king_counts[piece.side] -= 1
+
+    # endregion Private methods
@@ -0,0 +1,388 @@
+﻿from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Callable
+
+from src.model import MoveOrderer, MoveTables, TranspositionTable
+from src.model.BatchEvaluator import encode_game
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses import Bound, EvaluationWeights, Move, Outcome, Position, SearchResult, SearchStats, \
+    Side, TablebaseResult
+
+if TYPE_CHECKING:
+    from src.model import Game
+    from src.model.BatchEvaluator import BatchEvaluator
+    from src.model.Tablebase import Tablebase
+
+
+class _SearchTimeout(Exception):
+    pass
+
+
+class Engine:
+    """
+    Negamax alpha-beta search with iterative deepening, limited by depth and/or a time budget
+    """
+    WIN_SCORE = 1_000_000
+    # Scores this close to WIN_SCORE are wins/losses in a known number of plies
+    WIN_THRESHOLD = WIN_SCORE - 10_000
+    DEFAULT_MAX_DEPTH = 6
+
+    def __init__(self, max_depth: int | None = DEFAULT_MAX_DEPTH, time_limit_ms: float | None = None,
+                 weights: EvaluationWeights | None = None, table: TranspositionTable | None = None,
+                 move_orderer: MoveOrderer | None = None, tablebase: Tablebase | None = None,
+                 batch_evaluator: BatchEvaluator | None = None, collect_stats: bool = False):
+        self.max_depth = max_depth
+        self.time_limit_ms = time_limit_ms
+        self.weights = weights or EvaluationWeights()
+        self.table = table if table is not None else TranspositionTable()
+        self.move_orderer = move_orderer if move_orderer is not None else MoveOrderer()
+        # Exact results of small endgames, probed instead of searching them
+        self.tablebase = tablebase
+        # Evaluates the leaves of depth 1 nodes after their first move all at once, needs numpy.
+        # Off by default: it searches about the same nodes as the plain evaluation but isn't measurably faster.
+        self.batch_evaluator = batch_evaluator
+        # Fills SearchResult.stats, the phase timings cost two clock reads per node
+        self.collect_stats = collect_stats
+
+        self._nodes = 0
+        self._move_generation_time = 0.0
+        self._evaluation_time = 0.0
+        self._deadline: float | None = None
+        self._stop_event: threading.Event | None = None
+        # Best root move of the running iteration, used when the time runs out in the middle of it
+        self._iteration_best: tuple[Move, int] | None = None
+
+    def search(self, game: Game, max_depth: int | None = None, time_limit_ms: float | None = None,
+               stop_event: threading.Event | None = None,
+               on_progress: Callable[[SearchResult], None] | None = None,
+               window: tuple[int, int] | None = None) -> SearchResult:
+        """
+        Searches one depth deeper at a time until the depth limit is reached, the time runs out or stop_event is set.
+        When stopped early, the best move of the deepest search so far is returned.
+        The game is left as it was.
+        :param on_progress: called with the result of every finished depth
+        :param window: (alpha, beta) of the root, scores outside of it are only bounds: at most alpha or at least beta
+        """
+        max_depth = max_depth if max_depth is not None else self.max_depth
+        time_limit_ms = time_limit_ms if time_limit_ms is not None else self.time_limit_ms
+        if max_depth is None and time_limit_ms is None:
+            max_depth = self.DEFAULT_MAX_DEPTH
+
+        start_time = time.perf_counter()
+        self._deadline = start_time + time_limit_ms / 1000 if time_limit_ms is not None else None
+        self._stop_event = stop_event
+        self._nodes = 0
+        self._move_generation_time = self._evaluation_time = 0.0
+        self.move_orderer.new_search()
+        counters_before = self._get_counters() if self.collect_stats else None
+
+        root_moves = game.get_all_valid_moves(game.side_to_move)
+        if not root_moves:
+            return SearchResult(None, -self.WIN_SCORE, 0)
+
+        result = SearchResult(root_moves[0], 0, 0)
+        history_length = game.history_length
+        depth = 1
+
+        while max_depth is None or depth <= max_depth:
+            try:
+                move, score = self._search_root(game, root_moves, depth, result.move, window)
+            except _SearchTimeout:
+                # Take back the moves of the interrupted search
+                while game.history_length > history_length:
+                    game.unmake()
+
+                # Root moves searched before the timeout were searched fully, the best of them can be trusted.
+                # The depth stays the one of the last finished iteration.
+                if self._iteration_best is not None:
+                    move, score = self._iteration_best
+                    game.make(move)
+                    principal_variation = [move] + self._get_principal_variation(game, depth - 1)
+                    game.unmake()
+                    result = SearchResult(move, score, result.depth, principal_variation=principal_variation)
+                break
+
+            result = SearchResult(move, score, depth, principal_variation=self._get_principal_variation(game, depth))
+            if on_progress is not None:
+                on_progress(result)
+
+            # Forced win or loss found, deeper searches can't change it
+            if abs(score) >= self.WIN_THRESHOLD:
+                break
+            depth += 1
+
+        self._deadline = self._stop_event = None
+        result.nodes = self._nodes
+        result.elapsed_ms = (time.perf_counter() - start_time) * 1000
+        if self.collect_stats:
+            result.stats = self._get_stats(result, counters_before)
+        return result
+
+    def evaluate(self, game: Game) -> int:
+        """
+        :return: static score of the position from the point of view of the side to move
+        """
+        side = game.side_to_move
+        return self._evaluate_side(game, side) - self._evaluate_side(game, side.get_enemy())
+
+    # region Private methods
+
+    def _search_root(self, game: Game, moves: list[Move], depth: int, first_move: Move,
+                     window: tuple[int, int] | None = None) -> tuple[Move, int]:
+        # The best move of the previous depth goes first, it is the most likely best again
+        hash_move = (first_move.from_piece.position, first_move.to_position)
+        moves = self.move_orderer.order(moves, 0, hash_move)
+
+        alpha, beta = window if window is not None else (-self.WIN_SCORE - 1, self.WIN_SCORE + 1)
+        original_alpha = alpha
+        best_move = first_move
+        self._iteration_best = None
+        for move in moves:
+            game.make(move)
+            score = -self._negamax(game, depth - 1, -beta, -alpha, 1)
+            game.unmake()
+
+            if score > alpha:
+                alpha = score
+                best_move = move
+                self._iteration_best = (best_move, alpha)
+            if alpha >= beta:
+                break
+
+        if alpha <= original_alpha:
+            bound = Bound.UPPER
+        elif alpha >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.table.store(game.zobrist_key, depth, self._score_to_table(alpha, 0), bound,
+                         (best_move.from_piece.position, best_move.to_position))
+        return best_move, alpha
+
+    def _negamax(self, game: Game, depth: int, alpha: int, beta: int, ply: int) -> int:
+        self._nodes += 1
+        if (self._deadline is not None and time.perf_counter() > self._deadline) or \
+                (self._stop_event is not None and self._stop_event.is_set()):
+            raise _SearchTimeout()
+
+        original_alpha = alpha
+        key = game.zobrist_key
+        hash_move: tuple[Position, Position] | None = None
+
+        entry = self.table.probe(key)
+        if entry is not None:
+            hash_move = entry.best_move
+            if entry.depth >= depth:
+                score = self._score_from_table(entry.score, ply)
+                if entry.bound == Bound.EXACT:
+                    return score
+                if entry.bound == Bound.LOWER:
+                    alpha = max(alpha, score)
+                elif entry.bound == Bound.UPPER:
+                    beta = min(beta, score)
+                if alpha >= beta:
+                    return score
+
+        # No pieces left => the side to move has lost
+        if game.board.count_pieces(game.side_to_move) == 0:
+            return -self.WIN_SCORE + ply
+
+        if self.tablebase is not None:
+            tablebase_result = self.tablebase.probe(game)
+            if tablebase_result is not None:
+                return self._get_tablebase_score(tablebase_result, ply)
+
+        if depth <= 0:
+            if self.collect_stats:
+                start_time = time.perf_counter()
+                score = self.evaluate(game)
+                self._evaluation_time += time.perf_counter() - start_time
+                return score
+            return self.evaluate(game)
+
+        best_score = -self.WIN_SCORE - 1
+        best_move: Move | None = None
+
+        # The hash move is searched before the other moves are generated, a cutoff makes generating them needless
+        first_move = game.find_move(*hash_move) if hash_move is not None else None
+        if first_move is not None:
+            game.make(first_move)
+            best_score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+            game.unmake()
+            best_move = first_move
+            alpha = max(alpha, best_score)
+
+        if alpha < beta:
+            if self.collect_stats:
+                start_time = time.perf_counter()
+                moves = game.get_all_valid_moves(game.side_to_move)
+                self._move_generation_time += time.perf_counter() - start_time
+            else:
+                moves = game.get_all_valid_moves(game.side_to_move)
+            if first_move is not None:
+                moves = [move for move in moves
+                         if move.to_position != first_move.to_position or move.from_piece is not first_move.from_piece]
+            # No valid moves => the side to move has lost
+            elif not moves:
+                return -self.WIN_SCORE + ply
+
+            moves = self.move_orderer.order(moves, ply)
+            batch_frontier = depth == 1 and self.batch_evaluator is not None
+            frontier_scores: list[int] | None = None
+            # Index of the moves in the whole ordered list, with the hash move at 0
+            index_offset = 1 if first_move is not None else 0
+
+            for index, move in enumerate(moves):
+                if frontier_scores is not None:
+                    score = frontier_scores[index - 1]
+                else:
+                    game.make(move)
+                    score = -self._negamax(game, depth - 1, -beta, -alpha, ply + 1)
+                    game.unmake()
+
+                if score > best_score:
+                    best_score = score
+                    best_move = move
+                    if score > alpha:
+                        alpha = score
+                        if alpha >= beta:
+                            self.move_orderer.record_cutoff(move, ply, depth, index + index_offset)
+                            break
+
+                # Most cutoffs come from the first move, only the moves after it are evaluated in one batch
+                if batch_frontier and index == 0 and len(moves) > 1:
+                    frontier_scores = self._evaluate_frontier(game, moves[1:], ply + 1)
+        else:
+            self.move_orderer.record_cutoff(first_move, ply, depth, 0)
+
+        if best_score <= original_alpha:
+            bound = Bound.UPPER
+        elif best_score >= beta:
+            bound = Bound.LOWER
+        else:
+            bound = Bound.EXACT
+        self.table.store(key, depth, self._score_to_table(best_score, ply), bound,
+                         (best_move.from_piece.position, best_move.to_position))
+
+        return best_score
+
+    def _evaluate_frontier(self, game: Game, moves: list[Move], ply: int) -> list[int]:
+        """
+        Scores the leaf children of a depth 1 node with one batch_evaluator call.
+        Unlike _negamax, the leaves skip the transposition table probe.
+        :return: score of every move from the point of view of the side to move
+        """
+        scores: list[int | None] = []
+        leaves: list[list[int]] = []
+        for move in moves:
+            game.make(move)
+            self._nodes += 1
+            if game.board.count_pieces(game.side_to_move) == 0:
+                scores.append(self.WIN_SCORE - ply)
+            elif self.tablebase is not None and (tablebase_result := self.tablebase.probe(game)) is not None:
+                scores.append(-self._get_tablebase_score(tablebase_result, ply))
+            else:
+                scores.append(None)
+                leaves.append(encode_game(game))
+            game.unmake()
+
+        if leaves:
+            if self.collect_stats:
+                start_time = time.perf_counter()
+                leaf_scores = iter(self.batch_evaluator.evaluate(leaves, game.side_to_move).tolist())
+                self._evaluation_time += time.perf_counter() - start_time
+            else:
+                leaf_scores = iter(self.batch_evaluator.evaluate(leaves, game.side_to_move).tolist())
+            scores = [score if score is not None else next(leaf_scores) for score in scores]
+        return scores
+
+    def _get_counters(self) -> tuple[int, int, int, int]:
+        """
+        :return: running totals of table hits, table probes, cutoffs and first move cutoffs
+        """
+        return (self.table.hits, self.table.hits + self.table.misses,
+                self.move_orderer.cutoffs, self.move_orderer.first_move_cutoffs)
+
+    def _get_stats(self, result: SearchResult, counters_before: tuple[int, int, int, int]) -> SearchStats:
+        table_hits, table_probes, cutoffs, first_move_cutoffs = \
+            (after - before for after, before in zip(self._get_counters(), counters_before))
+        return SearchStats(nodes=result.nodes, depth=result.depth, elapsed_ms=result.elapsed_ms,
+                           table_hits=table_hits, table_probes=table_probes, cutoffs=cutoffs,
+                           first_move_cutoffs=first_move_cutoffs,
+                           move_generation_ms=self._move_generation_time * 1000,
+                           evaluation_ms=self._evaluation_time * 1000,
+                           principal_variation=list(result.principal_variation))
+
+    def _evaluate_side(self, game: Game, side: Side) -> int:
+        weights = self.weights
+        back_row = 0 if side == Side.BLACK else BOARD_SIZE - 1
+
+        score = 0
+        for piece in game.board.get_pieces(side):
+            if piece.is_king:
+                score += weights.king
+                continue
+
+            score += weights.man + weights.advancement * (BOARD_SIZE - 1 - piece.distance_from_edge())
+            if piece.position.row == back_row:
+                score += weights.back_rank
+
+        if weights.mobility:
+            board = game.board
+            score += weights.mobility * sum(1 for piece in board.get_pieces(side)
+                                            for position in MoveTables.get_steps(piece)
+                                            if board.get_piece(position) is None)
+
+        return score
+
+    def _get_principal_variation(self, game: Game, depth: int) -> list[Move]:
+        """
+        :return: best line found, followed through the transposition table
+        """
+        result: list[Move] = []
+        for _ in range(depth):
+            entry = self.table.probe(game.zobrist_key)
+            if entry is None or entry.best_move is None:
+                break
+
+            from_position, to_position = entry.best_move
+            piece = game.board.get_piece(from_position)
+            if piece is None or piece.side != game.side_to_move:
+                break
+            move = game.get_valid_moves(piece).get(to_position)
+            if move is None:
+                break
+
+            result.append(move)
+            game.make(move)
+
+        for _ in result:
+            game.unmake()
+
+        return result
+
+    def _get_tablebase_score(self, result: TablebaseResult, ply: int) -> int:
+        if result.outcome == Outcome.WIN:
+            return self.WIN_SCORE - ply - result.distance
+        if result.outcome == Outcome.LOSS:
+            return -self.WIN_SCORE + ply + result.distance
+        return 0
+
+    def _score_to_table(self, score: int, ply: int) -> int:
+        # Wins are stored relative to the stored position, not to the root
+        if score >= self.WIN_THRESHOLD:
+            return score + ply
+        if score <= -self.WIN_THRESHOLD:
+            return score - ply
+        return score
+
+    def _score_from_table(self, score: int, ply: int) -> int:
+        if score >= self.WIN_THRESHOLD:
+            return score - ply
+        if score <= -self.WIN_THRESHOLD:
+            return score + ply
+        return score
+
+    # endregion Private methods
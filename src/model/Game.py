@@ -2,12 +2,20 @@
 
 import datetime
 import random
+import threading
+import time
+from typing import TYPE_CHECKING, Callable, Iterator
 
-from src.model import Board
-from src.model.dataclasses import Side, Position, Move, Piece
+from src.model import BitBoard, Board, Engine, MoveTables, Zobrist
+from src.model.dataclasses import Side, Position, Move, Piece, SearchResult, SearchStats, UndoRecord
+
+if TYPE_CHECKING:
+    from src.model.OpeningBook import OpeningBook
+    from src.model.Tablebase import Tablebase
 
 
 class Game:
+    AI_TIME_LIMIT_MS = 1000
 
     def __init__(self):
         self.board = Board()
@@ -15,6 +23,51 @@ class Game:
         self.side_to_move = Side.BLACK
         self.ai_side: Side | None = None
         self.start_time = datetime.datetime.now()
+        self._undo_stack: list[UndoRecord] = []
+        # AI used by make_best_move, None falls back to the one move heuristic of get_best_move
+        self.engine: Engine | None = Engine(time_limit_ms=self.AI_TIME_LIMIT_MS)
+        # Consulted before the engine, positions out of the book are searched as usual
+        self.opening_book: OpeningBook | None = None
+        # Ends solved endgames in get_winner instead of playing them out
+        self.tablebase: Tablebase | None = None
+
+    @property
+    def zobrist_key(self) -> int:
+        """
+        64-bit key of the position: piece placement, kings and side to move
+        """
+        return self.board.zobrist_key ^ Zobrist.get_side_key(self.side_to_move)
+
+    @property
+    def history_length(self) -> int:
+        """
+        Number of moves that can be taken back with unmake
+        """
+        return len(self._undo_stack)
+
+    def get_position(self) -> tuple[int, int, int, int]:
+        """
+        :return: compact copy of the pieces and side to move, see Game.from_position
+        """
+        return BitBoard.from_game(self).encode()
+
+    @staticmethod
+    def from_position(position: tuple[int, int, int, int]) -> Game:
+        bit_board = BitBoard.decode(position)
+        game = Game()
+        game.board = bit_board.to_board()
+        game.side_to_move = bit_board.side_to_move
+        return game
+
+    def find_move(self, from_position: Position, to_position: Position) -> Move | None:
+        piece = self.board.get_piece(from_position)
+        if piece is None or piece.side != self.side_to_move:
+            return None
+
+        for move in self.iter_piece_moves(piece):
+            if move.to_position == to_position:
+                return move
+        return None
 
     def is_move_valid(self, from_position: Position, to_position: Position) -> bool:
         from_piece = self.board.get_piece(from_position)
@@ -29,79 +82,135 @@ class Game:
             return False
 
         # Move to a neighbouring cell
-        if to_position in from_piece.get_possible_moves(long_jump=False):
+        if to_position in MoveTables.get_steps(from_piece):
             return True
 
         # Move over an enemy piece
-        if to_position in from_piece.get_possible_moves(long_jump=True):
-            inbetween_piece = self.board.get_piece_between(from_position, to_position)
-            if inbetween_piece is not None and inbetween_piece.side == from_piece.side.get_enemy():
-                return True
+        for jumped_position, landing_position in MoveTables.get_jumps(from_piece):
+            if landing_position == to_position:
+                inbetween_piece = self.board.get_piece(jumped_position)
+                return inbetween_piece is not None and inbetween_piece.side == from_piece.side.get_enemy()
 
         return False
 
     def get_valid_moves(self, piece: Piece) -> dict[Position, Move]:
-        moves: dict[Position, Move] = dict()
-
         # Empty field
         if piece is None:
-            return moves
+            return dict()
+
+        return {move.to_position: move for move in self.iter_piece_moves(piece)}
 
-        for position in piece.get_possible_moves(long_jump=False):
-            if self.is_move_valid(piece.position, position):
-                moves[position] = Move(piece, position, [])
+    def iter_piece_moves(self, piece: Piece) -> Iterator[Move]:
+        """
+        Generates the simple moves of the piece one by one, then every prefix of every jump chain, one move per
+        landing field (of jump chains ending on the same field, the last one found)
+        """
+        get_piece = self.board.get_piece
+        for position in MoveTables.get_steps(piece):
+            if get_piece(position) is None:
+                yield Move(piece, position, [])
+
+        enemy_side = piece.side.get_enemy()
+        first_jumps = [(jumped_piece, to_position) for jumped_position, to_position in MoveTables.get_jumps(piece)
+                       if (jumped_piece := get_piece(jumped_position)) is not None
+                       and jumped_piece.side == enemy_side and get_piece(to_position) is None]
+        if not first_jumps:
+            return
 
-        def long_jump(jumped_pieces: list[Piece]):
+        jumps = MoveTables.JUMPS[piece.side][piece.is_king]
+        jump_moves: dict[Position, Move] = {}
+
+        def long_jump(position: Position, jumped_pieces: list[Piece]):
             # Go through valid double jumps
-            for to_position in piece.get_possible_moves(long_jump=True):
-                if not self.is_move_valid(piece.position, to_position):
+            for jumped_position, to_position in jumps[position]:
+                # The piece itself has already left its original position
+                if to_position != piece.position and get_piece(to_position) is not None:
                     continue
 
-                # Add enemy piece to the list of jumped pieces
-                # We know the piece between is an enemy because of the is_move_valid check
-                enemy_piece = self.board.get_piece_between(piece.position, to_position)
-                if enemy_piece in jumped_pieces:
+                enemy_piece = get_piece(jumped_position)
+                if enemy_piece is None or enemy_piece.side != enemy_side or enemy_piece in jumped_pieces:
                     continue
-                moves[to_position] = Move(piece, to_position, jumped_pieces + [enemy_piece])
+                jump_moves[to_position] = Move(piece, to_position, jumped_pieces + [enemy_piece])
 
-                # Temporarily move the piece to the new position
-                original_position = piece.position
-                self.board.update_piece_position(piece, to_position)
+                # Check for more jumps from the new position
+                long_jump(to_position, jumped_pieces + [enemy_piece])
 
-                # Check for more jumps with the new position
-                long_jump(jumped_pieces + [enemy_piece])
+        for jumped_piece, to_position in first_jumps:
+            jump_moves[to_position] = Move(piece, to_position, [jumped_piece])
+            long_jump(to_position, [jumped_piece])
+        yield from jump_moves.values()
 
-                # Revert the temporary move
-                self.board.update_piece_position(piece, original_position)
+    def iter_moves(self, side: Side) -> Iterator[Move]:
+        """
+        Generates the moves of all pieces of the side, piece by piece, see iter_piece_moves
+        """
+        for piece in self.board.get_pieces(side):
+            yield from self.iter_piece_moves(piece)
 
-        long_jump([])
+    def apply_move(self, move: Move) -> None:
+        self.make(move)
 
-        return moves
+    def make(self, move: Move) -> None:
+        """
+        Makes the move in place, it can be taken back with unmake
+        """
+        piece = move.from_piece
+        captured_pieces = move.jumped_pieces or []
+        promoted = not piece.is_king and move.becomes_king()
+        self._undo_stack.append(UndoRecord(piece, piece.position, captured_pieces, promoted, self.side_to_move))
 
-    def apply_move(self, move: Move) -> None:
-        self.board.update_piece_position(move.from_piece, move.to_position)
+        self.board.update_piece_position(piece, move.to_position)
 
         # Remove jumped pieces
-        for piece in move.jumped_pieces:
-            self.board.delete_piece(piece)
+        for captured_piece in captured_pieces:
+            self.board.delete_piece(captured_piece)
 
         # Check if the piece should be crowned
-        move.from_piece.is_king = move.becomes_king()
+        if promoted:
+            self.board.set_king(piece, True)
 
         self.next_move()
 
+    def unmake(self) -> None:
+        """
+        Takes back the last move made with make
+        """
+        record = self._undo_stack.pop()
+
+        if record.promoted:
+            self.board.set_king(record.piece, False)
+
+        for captured_piece in record.captured_pieces:
+            self.board.set_piece(captured_piece)
+
+        self.board.update_piece_position(record.piece, record.from_position)
+        self.side_to_move = record.side_to_move
+
     def next_move(self) -> None:
         self.side_to_move = self.side_to_move.get_enemy()
 
     def get_all_valid_moves(self, side: Side) -> list[Move]:
-        result: list[Move] = []
+        return list(self.iter_moves(side))
 
-        pieces = self.board.get_pieces(side)
-        for piece in pieces:
-            moves = self.get_valid_moves(piece)
-            result += moves.values()
+    def has_any_valid_move(self, side: Side) -> bool:
+        """
+        Same as bool(get_all_valid_moves(side)), but stops at the first move found.
+        Faster than next(iter_moves(side)), no generators are created for pieces without moves.
+        """
+        board = self.board
+        enemy_side = side.get_enemy()
+        for piece in board.get_pieces(side):
+            for position in MoveTables.get_steps(piece):
+                if board.get_piece(position) is None:
+                    return True
+
+            # Every jump chain starts with a single jump
+            for jumped_position, to_position in MoveTables.get_jumps(piece):
+                jumped_piece = board.get_piece(jumped_position)
+                if jumped_piece is not None and jumped_piece.side == enemy_side and board.get_piece(to_position) is None:
+                    return True
 
-        return result
+        return False
 
     def get_best_move(self, moves: list[Move]) -> Move | None:
         # Piece jumps over an enemy piece
@@ -117,14 +226,7 @@ class Game:
             """
             :return: list of pieces that can jump over the given piece
             """
-            result: list[Piece] = []
-
-            enemy_moves = self.get_all_valid_moves(piece.side.get_enemy())
-            for enemy_move in enemy_moves:
-                if piece in enemy_move.jumped_pieces:
-                    result.append(enemy_move.from_piece)
-
-            return result
+            return self.board.get_attackers(piece.position)
 
         if not moves:
             return None
@@ -138,12 +240,9 @@ class Game:
             score += int(move.becomes_king()) * KING_SCORE
 
             # Temporarily make move and check if piece is threatened after
-            original_position = move.from_piece.position
-            self.board.update_piece_position(move.from_piece, move.to_position)
+            self.make(move)
             score += len(threatened_by(move.from_piece)) * THREAT_AFTER_MOVE_SCORE
-
-            # Revert the temporary move
-            self.board.update_piece_position(move.from_piece, original_position)
+            self.unmake()
 
             scores[move] = score
 
@@ -164,13 +263,17 @@ class Game:
 
     def get_winner(self) -> Side | None:
         # No remaining pieces or no valid moves for white
-        if not self.board.get_pieces(Side.WHITE) or not self.get_all_valid_moves(Side.WHITE):
+        if self.board.count_pieces(Side.WHITE) == 0 or not self.has_any_valid_move(Side.WHITE):
             return Side.BLACK
 
         # No remaining pieces or no valid moves for black
-        if not self.board.get_pieces(Side.BLACK) or not self.get_all_valid_moves(Side.BLACK):
+        if self.board.count_pieces(Side.BLACK) == 0 or not self.has_any_valid_move(Side.BLACK):
             return Side.WHITE
 
+        # Solved endgame => the side that wins with perfect play
+        if self.tablebase is not None:
+            return self.tablebase.adjudicate(self)
+
         return None
 
     def get_game_time_seconds(self) -> int:
@@ -180,6 +283,7 @@ class Game:
         self.board = save.board
         self.side_to_move = save.current_turn
         self.ai_side = save.ai_side
+        self._undo_stack.clear()
         self.start_time = datetime.datetime.now() - datetime.timedelta(seconds=save.game_time_seconds)
 
     def is_ai_turn(self) -> bool:
@@ -220,7 +324,34 @@ class Game:
         moves = self.get_valid_moves(piece)
         return [move.to_position for move in moves.values()]
 
-    def make_best_move(self):
-        moves = self.get_all_valid_moves(self.side_to_move)
-        move = self.get_best_move(moves)
-        self.apply_move(move)
+    def make_best_move(self) -> SearchStats | None:
+        """
+        :return: how the move was found, None unless the engine collects stats
+        """
+        move, stats = self.find_best_move()
+
+        # No valid moves => opponent wins
+        if move is not None:
+            self.apply_move(move)
+        return stats
+
+    def find_best_move(self, stop_event: threading.Event | None = None,
+                       on_progress: Callable[[SearchResult], None] | None = None) \
+            -> tuple[Move | None, SearchStats | None]:
+        """
+        Picks the AI move without making it: a book move, the engine's choice or the one move heuristic
+        :param stop_event: ends the engine search early, see Engine.search
+        :return: the move (None if there is no valid move) and how it was found, see make_best_move
+        """
+        start_time = time.perf_counter()
+
+        move = self.opening_book.choose_move(self) if self.opening_book is not None else None
+        if move is None and self.engine is None:
+            return self.get_best_move(self.get_all_valid_moves(self.side_to_move)), None
+        elif move is None:
+            result = self.engine.search(self, stop_event=stop_event, on_progress=on_progress)
+            return result.move, result.stats
+        elif self.engine is not None and self.engine.collect_stats:
+            return move, SearchStats("book", elapsed_ms=(time.perf_counter() - start_time) * 1000,
+                                     principal_variation=[move])
+        return move, None
@@ -0,0 +1,89 @@
+﻿from __future__ import annotations
+
+from src.model.dataclasses import Move, Position
+
+
+class MoveOrderer:
+    """
+    Sorts moves so the ones most likely to cause an alpha-beta cutoff are searched first:
+    hash move, captures (longest chain first), promotions, killer moves of the ply, then by history
+    """
+    HASH_MOVE_SCORE = 10_000_000
+    CAPTURE_SCORE = 1_000_000
+    JUMPED_PIECE_SCORE = 10_000
+    PROMOTION_SCORE = 500_000
+    KILLER_SCORES = (400_000, 300_000)
+    # History scores are kept below the killer scores
+    MAX_HISTORY_SCORE = 200_000
+
+    def __init__(self):
+        # Quiet moves that caused a cutoff, per ply, newest first
+        self._killers: list[list[tuple[Position, Position]]] = []
+        # How much each (from, to) move caused cutoffs so far
+        self._history: dict[tuple[Position, Position], int] = {}
+
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    @property
+    def first_move_cutoff_rate(self) -> float:
+        """
+        :return: share of the cutoffs caused by the first move tried, the closer to 1 the better the ordering
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def new_search(self) -> None:
+        """
+        Forgets the killers and ages the history before a new search
+        """
+        self._killers.clear()
+        self._history = {move: score // 2 for move, score in self._history.items() if score > 1}
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+
+    def order(self, moves: list[Move], ply: int, hash_move: tuple[Position, Position] | None = None) -> list[Move]:
+        killers = self._killers[ply] if ply < len(self._killers) else ()
+
+        def get_score(move: Move) -> int:
+            key = (move.from_piece.position, move.to_position)
+            if key == hash_move:
+                return self.HASH_MOVE_SCORE
+
+            score = 0
+            if move.jumped_pieces:
+                score += self.CAPTURE_SCORE + len(move.jumped_pieces) * self.JUMPED_PIECE_SCORE
+            if not move.from_piece.is_king and move.becomes_king():
+                score += self.PROMOTION_SCORE
+            if score:
+                return score
+
+            for killer, killer_score in zip(killers, self.KILLER_SCORES):
+                if key == killer:
+                    return killer_score
+
+            return self._history.get(key, 0)
+
+        return sorted(moves, key=get_score, reverse=True)
+
+    def record_cutoff(self, move: Move, ply: int, depth: int, move_index: int) -> None:
+        """
+        :param move_index: position of the move in the ordered list
+        """
+        self.cutoffs += 1
+        if move_index == 0:
+            self.first_move_cutoffs += 1
+
+        # Captures are ordered first anyway
+        if move.jumped_pieces:
+            return
+
+        key = (move.from_piece.position, move.to_position)
+
+        while len(self._killers) <= ply:
+            self._killers.append([])
+        killers = self._killers[ply]
+        if key not in killers:
+            killers.insert(0, key)
+            del killers[len(self.KILLER_SCORES):]
+
+        self._history[key] = min(self._history.get(key, 0) + depth * depth, self.MAX_HISTORY_SCORE)
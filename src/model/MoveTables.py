@@ -0,0 +1,84 @@
+﻿from __future__ import annotations
+
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses.Position import Position
+from src.model.dataclasses.Side import Side
+
+# Built once at import, move generation only does lookups:
+# STEPS[side][is_king][position] -> neighbouring positions the piece can step to
+# JUMPS[side][is_king][position] -> (jumped position, landing position) pairs
+STEPS: dict[Side, dict[bool, dict[Position, tuple[Position, ...]]]] = {}
+JUMPS: dict[Side, dict[bool, dict[Position, tuple[tuple[Position, Position], ...]]]] = {}
+# Every jump any piece could make: (attacker position, jumped position, landing position, row step)
+JUMP_LINES: list[tuple[Position, Position, Position, int]] = []
+# LINES_THROUGH[position] -> indices of the JUMP_LINES the position is part of
+LINES_THROUGH: dict[Position, tuple[int, ...]] = {}
+
+
+def _get_directions(side: Side, is_king: bool) -> tuple[tuple[int, int], ...]:
+    # Same order as the original Piece.get_possible_moves
+    if is_king:
+        return (1, 1), (1, -1), (-1, 1), (-1, -1)
+    elif side == Side.WHITE:
+        return (-1, 1), (-1, -1)
+    elif side == Side.BLACK:
+        return (1, 1), (1, -1)
+    raise ValueError("Unknown side")
+
+
+def _is_on_board(row: int, column: int) -> bool:
+    return 0 <= row < BOARD_SIZE and 0 <= column < BOARD_SIZE
+
+
+def _build_tables() -> None:
+    for side in Side:
+        STEPS[side] = {}
+        JUMPS[side] = {}
+        for is_king in (False, True):
+            directions = _get_directions(side, is_king)
+            steps = STEPS[side][is_king] = {}
+            jumps = JUMPS[side][is_king] = {}
+
+            for row in range(BOARD_SIZE):
+                for column in range(BOARD_SIZE):
+                    position = Position.at(row, column)
+                    steps[position] = tuple(Position.at(row + row_step, column + column_step)
+                                            for row_step, column_step in directions
+                                            if _is_on_board(row + row_step, column + column_step))
+                    jumps[position] = tuple((Position.at(row + row_step, column + column_step),
+                                             Position.at(row + 2 * row_step, column + 2 * column_step))
+                                            for row_step, column_step in directions
+                                            if _is_on_board(row + 2 * row_step, column + 2 * column_step))
+
+    lines_through: dict[Position, list[int]] = {}
+    for row in range(BOARD_SIZE):
+        for column in range(BOARD_SIZE):
+            for row_step, column_step in _get_directions(Side.WHITE, True):
+                if not _is_on_board(row + 2 * row_step, column + 2 * column_step):
+                    continue
+
+                line = (Position.at(row, column),
+                        Position.at(row + row_step, column + column_step),
+                        Position.at(row + 2 * row_step, column + 2 * column_step),
+                        row_step)
+                for position in line[:3]:
+                    lines_through.setdefault(position, []).append(len(JUMP_LINES))
+                JUMP_LINES.append(line)
+
+    for position, lines in lines_through.items():
+        LINES_THROUGH[position] = tuple(lines)
+
+
+_build_tables()
+
+
+def get_steps(piece) -> tuple[Position, ...]:
+    return STEPS[piece.side][piece.is_king][piece.position]
+
+
+def get_jumps(piece) -> tuple[tuple[Position, Position], ...]:
+    return JUMPS[piece.side][piece.is_king][piece.position]
+
+
+def get_forward_row_step(side: Side) -> int:
+    return 1 if side == Side.BLACK else -1
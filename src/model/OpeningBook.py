@@ -0,0 +1,155 @@
+﻿from __future__ import annotations
+
+import argparse
+import mmap
+import os
+import random
+import struct
+from collections import Counter
+
+from src.model import Engine, Game
+from src.model.BitBoard import square_index, square_position
+from src.model.dataclasses import Move, Position
+
+
+class OpeningBook:
+    """
+    Weighted book moves by position, stored as fixed-size entries sorted by Game.zobrist_key,
+    so a lookup is a binary search over the memory-mapped file
+    """
+    # Next to the src package, independent of the working directory
+    DEFAULT_FILE = os.path.normpath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "opening_book.bin"))
+    MAGIC = b"CKBK"
+    HEADER = struct.Struct("<4sI")
+    # Position key, from field, to field, weight
+    ENTRY = struct.Struct("<QBBH")
+    MAX_WEIGHT = 0xFFFF
+
+    def __init__(self, file_path: str = DEFAULT_FILE):
+        self._file = open(file_path, "rb")
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, self.entry_count = self.HEADER.unpack_from(self._data, 0)
+        if magic != self.MAGIC:
+            self.close()
+            raise ValueError(f"{file_path} is not an opening book")
+
+    def get_moves(self, game: Game) -> list[tuple[Move, int]]:
+        """
+        :return: book moves with their weights, empty if the position is not in the book
+        """
+        key = game.zobrist_key
+        result: list[tuple[Move, int]] = []
+
+        index = self._find_first(key)
+        while index < self.entry_count:
+            entry_key, from_square, to_square, weight = self._get_entry(index)
+            if entry_key != key:
+                break
+
+            move = game.find_move(square_position(from_square), square_position(to_square))
+            if move is not None:
+                result.append((move, weight))
+            index += 1
+
+        return result
+
+    def choose_move(self, game: Game, rng: random.Random | None = None) -> Move | None:
+        moves = self.get_moves(game)
+        if not moves:
+            return None
+
+        rng = rng or random
+        return rng.choices([move for move, _ in moves], weights=[weight for _, weight in moves])[0]
+
+    def close(self) -> None:
+        self._data.close()
+        self._file.close()
+
+    @staticmethod
+    def write(file_path: str, entries: dict[int, dict[tuple[Position, Position], int]]) -> None:
+        """
+        :param entries: position key -> (from position, to position) -> weight
+        """
+        rows = sorted((key, square_index(from_position), square_index(to_position), min(weight, OpeningBook.MAX_WEIGHT))
+                      for key, moves in entries.items()
+                      for (from_position, to_position), weight in moves.items())
+
+        with open(file_path, "wb") as f:
+            f.write(OpeningBook.HEADER.pack(OpeningBook.MAGIC, len(rows)))
+            for row in rows:
+                f.write(OpeningBook.ENTRY.pack(*row))
+
+    @staticmethod
+    def build(file_path: str, games: int, plies: int, depth: int, margin: int = 10, seed: int = 0,
+              log=print) -> None:
+        """
+        Plays self-play games from the initial position. Every move is picked at random among the moves scoring
+        within margin of the best one at the given search depth. Weights are how often a move was picked.
+        """
+        rng = random.Random(seed)
+        engine = Engine(max_depth=depth)
+        entries: dict[int, Counter] = {}
+        scores_cache: dict[int, list[tuple[tuple[Position, Position], int]]] = {}
+
+        for game_number in range(games):
+            game = Game()
+            for _ in range(plies):
+                key = game.zobrist_key
+                if key not in scores_cache:
+                    scores_cache[key] = OpeningBook._score_moves(game, engine, depth)
+                scored_moves = scores_cache[key]
+                if not scored_moves:
+                    break
+
+                best_score = max(score for _, score in scored_moves)
+                candidates = [move for move, score in scored_moves if score >= best_score - margin]
+                choice = rng.choice(candidates)
+                entries.setdefault(key, Counter())[choice] += 1
+                game.make(game.find_move(*choice))
+
+            log(f"Game {game_number + 1}/{games}: {len(entries)} positions")
+
+        OpeningBook.write(file_path, entries)
+
+    # region Private methods
+
+    def _get_entry(self, index: int) -> tuple[int, int, int, int]:
+        return self.ENTRY.unpack_from(self._data, self.HEADER.size + index * self.ENTRY.size)
+
+    def _find_first(self, key: int) -> int:
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._get_entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    @staticmethod
+    def _score_moves(game: Game, engine: Engine, depth: int) -> list[tuple[tuple[Position, Position], int]]:
+        """
+        :return: (from position, to position) of every valid move with its search score
+        """
+        result: list[tuple[tuple[Position, Position], int]] = []
+        for move in game.get_all_valid_moves(game.side_to_move):
+            from_position = move.from_piece.position
+            game.make(move)
+            score = -engine.evaluate(game) if depth <= 1 else -engine.search(game, depth - 1).score
+            game.unmake()
+            result.append(((from_position, move.to_position), score))
+        return result
+
+    # endregion Private methods
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Builds an opening book from self-play")
+    parser.add_argument("--games", type=int, default=50)
+    parser.add_argument("--plies", type=int, default=8, help="book depth in plies")
+    parser.add_argument("--depth", type=int, default=4, help="search depth used to score the moves")
+    parser.add_argument("--margin", type=int, default=10, help="score margin of the moves still played")
+    parser.add_argument("--output", default=OpeningBook.DEFAULT_FILE)
+    args = parser.parse_args()
+    OpeningBook.build(args.output, args.games, args.plies, args.depth, args.margin)
@@ -0,0 +1,187 @@
+﻿from __future__ import annotations
+
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.model import BitBoard, Engine, Game, MoveOrderer, SharedTranspositionTable
+from src.model.BitBoard import square_index, square_position
+from src.model.dataclasses import EvaluationWeights, Move, SearchResult
+
+# Engine of the worker process, kept between tasks so its transposition table is reused
+_worker_engine: Engine | None = None
+
+# Transposition table counters summed up over the tasks
+TABLE_STATS = ("hits", "misses", "cross_worker_hits")
+
+
+def _init_worker(weights: EvaluationWeights, table_name: str | None, worker_ids) -> None:
+    global _worker_engine
+
+    table = None
+    if table_name is not None:
+        with worker_ids.get_lock():
+            worker_ids.value += 1
+            worker_id = worker_ids.value % SharedTranspositionTable.MAX_WORKER_ID + 1
+        table = SharedTranspositionTable.attach(table_name, worker_id)
+
+    _worker_engine = Engine(max_depth=None, weights=weights, table=table)
+
+
+def _get_table_stats() -> dict[str, int]:
+    stats = _worker_engine.table.get_stats()
+    return {name: stats.get(name, 0) for name in TABLE_STATS}
+
+
+def _encode_move(move: Move) -> tuple[int, int]:
+    return square_index(move.from_piece.position), square_index(move.to_position)
+
+
+def _decode_move(game: Game, move: tuple[int, int]) -> Move | None:
+    return game.find_move(square_position(move[0]), square_position(move[1]))
+
+
+def _to_worker_score(score: int) -> int:
+    """
+    :return: score of the root turned into the score of the worker's search one ply deeper, see _search_root_move
+    """
+    if score >= Engine.WIN_THRESHOLD - 1:
+        return -(score + 1)
+    if score <= -(Engine.WIN_THRESHOLD - 1):
+        return -(score - 1)
+    return -score
+
+
+def _search_root_move(position: tuple[int, int, int, int], move: tuple[int, int], depth: int,
+                      time_limit_ms: float | None, window: tuple[int, int] | None = None) \
+        -> tuple[int, list[tuple[int, int]], int, dict[str, int]]:
+    """
+    Searches the subtree of one root move in a worker process
+    :param window: (alpha, beta) from the point of view of the side to move at the root, None for the full window
+    :return: score from the point of view of the side to move at the root, principal variation, nodes,
+             transposition table counters of this task
+    """
+    game = Game.from_position(position)
+    game.make(_decode_move(game, move))
+
+    if depth <= 1:
+        # Same leaf as Engine._negamax one ply from the root: no pieces left => the side to move has lost
+        if game.board.count_pieces(game.side_to_move) == 0:
+            score = Engine.WIN_SCORE - 1
+        else:
+            score = -_worker_engine.evaluate(game)
+        return score, [move], 1, dict.fromkeys(TABLE_STATS, 0)
+
+    stats_before = _get_table_stats()
+    worker_window = (_to_worker_score(window[1]), _to_worker_score(window[0])) if window is not None else None
+    result = _worker_engine.search(game, depth - 1, time_limit_ms, window=worker_window)
+    table_stats = {name: value - stats_before[name] for name, value in _get_table_stats().items()}
+    score = -result.score
+    # One ply further from the root than the worker's own search
+    if score >= Engine.WIN_THRESHOLD:
+        score -= 1
+    elif score <= -Engine.WIN_THRESHOLD:
+        score += 1
+
+    return score, [move] + [_encode_move(reply) for reply in result.principal_variation], result.nodes, table_stats
+
+
+class ParallelSearch:
+    """
+    Splits the root moves over a pool of worker processes, each one searches its subtrees with its own Engine.
+    Positions are sent as BitBoard encodings, not pickled Boards.
+    With shared_table_bytes, all workers use one SharedTranspositionTable instead of a table each.
+    """
+
+    def __init__(self, workers: int | None = None, weights: EvaluationWeights | None = None,
+                 shared_table_bytes: int | None = None):
+        self.shared_table: SharedTranspositionTable | None = None
+        if shared_table_bytes is not None:
+            self.shared_table = SharedTranspositionTable.create(shared_table_bytes)
+
+        table_name = self.shared_table.name if self.shared_table is not None else None
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(weights or EvaluationWeights(), table_name,
+                                                       multiprocessing.Value("i", 0)))
+        self.table_stats: dict[str, int] = dict.fromkeys(TABLE_STATS, 0)
+
+    @property
+    def cross_worker_hit_rate(self) -> float:
+        """
+        :return: share of the workers' table hits on entries stored by another worker
+        """
+        hits = self.table_stats["hits"]
+        return self.table_stats["cross_worker_hits"] / hits if hits else 0.0
+
+    def search(self, game: Game, depth: int, time_limit_ms: float | None = None) -> SearchResult:
+        """
+        Searches every root move to the given depth, the time limit applies to each root move separately.
+        The first move is searched alone, the others in parallel with a null window around its score:
+        they only have to prove that they aren't better, and the few that are get searched again.
+        """
+        start_time = time.perf_counter()
+        root_moves = game.get_all_valid_moves(game.side_to_move)
+        if not root_moves:
+            return SearchResult(None, -Engine.WIN_SCORE, 0)
+
+        position = BitBoard.from_game(game).encode()
+        moves = [_encode_move(move) for move in MoveOrderer().order(root_moves, 0)]
+        nodes = 0
+
+        def get_result(move: tuple[int, int], window: tuple[int, int] | None) -> tuple[int, list[tuple[int, int]]]:
+            return collect(self._executor.submit(_search_root_move, position, move, depth, time_limit_ms, window))
+
+        def collect(future) -> tuple[int, list[tuple[int, int]]]:
+            nonlocal nodes
+            score, line, move_nodes, table_stats = future.result()
+            nodes += move_nodes + 1
+            for name, value in table_stats.items():
+                self.table_stats[name] += value
+            return score, line
+
+        best_score, best_line = get_result(moves[0], None)
+        null_window = (best_score, best_score + 1)
+        futures = [(move, self._executor.submit(_search_root_move, position, move, depth, time_limit_ms, null_window))
+                   for move in moves[1:]]
+
+        for move, future in futures:
+            score, line = collect(future)
+            # Failed high => maybe better than the best move so far, its exact score is needed
+            if score > null_window[0]:
+                score, line = get_result(move, (best_score, Engine.WIN_SCORE + 1))
+                if score > best_score:
+                    best_score, best_line = score, line
+
+        principal_variation = self._decode_line(game, best_line)
+        return SearchResult(principal_variation[0], best_score, depth, nodes,
+                            (time.perf_counter() - start_time) * 1000, principal_variation)
+
+    def close(self) -> None:
+        self._executor.shutdown()
+        if self.shared_table is not None:
+            self.shared_table.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    # region Private methods
+
+    @staticmethod
+    def _decode_line(game: Game, line: list[tuple[int, int]]) -> list[Move]:
+        result: list[Move] = []
+        for encoded_move in line:
+            move = _decode_move(game, encoded_move)
+            if move is None:
+                break
+            result.append(move)
+            game.make(move)
+
+        for _ in result:
+            game.unmake()
+
+        return result
+
+    # endregion Private methods
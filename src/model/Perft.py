@@ -0,0 +1,111 @@
+﻿from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+
+from src.model import BitBoard, Game, SaveParser
+
+PERFT_FOLDER = os.path.join(os.path.dirname(__file__), "perft")
+INITIAL_POSITION = "initial"
+BACKENDS = ("game", "bitboard")
+
+# Leaf counts at depth 1, 2, ... of the initial position and of the save files in PERFT_FOLDER.
+# Captures aren't mandatory and every prefix of a jump chain is a move of its own, so these differ from
+# the usual checkers perft numbers.
+REFERENCE_COUNTS: dict[str, tuple[int, ...]] = {
+    INITIAL_POSITION: (7, 49, 379, 2872, 23582, 190647, 1607272),
+    "midgame.txt": (6, 61, 473, 4580, 36454, 340982, 2788546),
+    "kings.txt": (7, 41, 315, 1950, 16100, 102406, 885678),
+    "jumps.txt": (9, 74, 586, 5028, 39899, 347820, 2792188),
+}
+
+
+def perft_game(game: Game, depth: int) -> int:
+    """
+    :return: number of move sequences of the given length, made and taken back on the game
+    """
+    moves = game.get_all_valid_moves(game.side_to_move)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    nodes = 0
+    for move in moves:
+        game.make(move)
+        nodes += perft_game(game, depth - 1)
+        game.unmake()
+    return nodes
+
+
+def perft_bit_board(bit_board: BitBoard, depth: int) -> int:
+    moves = bit_board.get_all_valid_moves(bit_board.side_to_move)
+    if depth <= 1:
+        return len(moves) if depth == 1 else 1
+
+    return sum(perft_bit_board(bit_board.apply_move(move), depth - 1) for move in moves)
+
+
+def load_position(name: str) -> Game:
+    """
+    :param name: INITIAL_POSITION, a file in PERFT_FOLDER or a path to a save file
+    """
+    game = Game()
+    if name != INITIAL_POSITION:
+        path = os.path.join(PERFT_FOLDER, name) if not os.path.exists(name) else name
+        game.load_save_state(SaveParser.load(path))
+    return game
+
+
+def run_perft(game: Game, depth: int, backend: str) -> tuple[int, float]:
+    """
+    :return: leaf count and seconds taken
+    """
+    start_time = time.perf_counter()
+    if backend == "game":
+        nodes = perft_game(game, depth)
+    elif backend == "bitboard":
+        nodes = perft_bit_board(BitBoard.from_game(game), depth)
+    else:
+        raise ValueError(f"Unknown backend {backend}")
+    return nodes, time.perf_counter() - start_time
+
+
+def check_position(name: str, depth: int, backend: str, log=print) -> bool:
+    """
+    Runs perft to every depth up to the given one and compares the counts with REFERENCE_COUNTS
+    :return: False if any count differs from its reference
+    """
+    game = load_position(name)
+    expected_counts = REFERENCE_COUNTS.get(name, ())
+    is_correct = True
+
+    for current_depth in range(1, depth + 1):
+        nodes, seconds = run_perft(game, current_depth, backend)
+        expected = expected_counts[current_depth - 1] if current_depth <= len(expected_counts) else None
+        if expected is None:
+            status = "no reference"
+        elif nodes == expected:
+            status = "ok"
+        else:
+            status = f"MISMATCH, expected {expected}"
+            is_correct = False
+
+        nodes_per_second = nodes / seconds if seconds > 0 else float("inf")
+        log(f"{name} {backend} depth {current_depth}: {nodes} nodes in {seconds * 1000:.1f} ms "
+            f"({nodes_per_second:,.0f} nodes/s) {status}")
+
+    return is_correct
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Counts the leaf nodes of the move tree and checks them")
+    parser.add_argument("--depth", type=int, default=5)
+    parser.add_argument("--backend", choices=BACKENDS + ("all",), default="all")
+    parser.add_argument("positions", nargs="*", default=list(REFERENCE_COUNTS),
+                        help=f'"{INITIAL_POSITION}", names of files in {PERFT_FOLDER} or paths of save files')
+    args = parser.parse_args()
+
+    backends = BACKENDS if args.backend == "all" else (args.backend,)
+    results = [check_position(position, args.depth, backend) for position in args.positions for backend in backends]
+    sys.exit(0 if all(results) else 1)
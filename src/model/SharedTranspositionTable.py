@@ -0,0 +1,172 @@
+﻿from __future__ import annotations
+
+from multiprocessing import shared_memory
+
+from src.model.BitBoard import square_index, square_position
+from src.model.TranspositionTable import TranspositionEntry
+from src.model.dataclasses import Bound, Position
+
+
+class SharedTranspositionTable:
+    """
+    Transposition table in shared memory, usable by many processes at once without locks.
+    Every entry is two 64-bit words: key ^ data and data. A half-written entry fails the xor check and reads as
+    a miss. Same bucket policy and interface as TranspositionTable.
+    """
+    ENTRY_SIZE_BYTES = 16
+    BUCKET_SIZE = 2
+
+    # Layout of the data word
+    _SCORE_BITS = 32
+    _SCORE_OFFSET = 1 << (_SCORE_BITS - 1)
+    _DEPTH_SHIFT = 32
+    _BOUND_SHIFT = 40
+    _FROM_SHIFT = 42
+    _TO_SHIFT = 48
+    _WORKER_SHIFT = 54
+    _NO_MOVE = 0x3F
+    MAX_WORKER_ID = 0xFF
+
+    def __init__(self, memory: shared_memory.SharedMemory, worker_id: int, owner: bool):
+        self._memory = memory
+        self._words = memory.buf.cast("Q")
+        self._mask = len(self._words) // (2 * self.BUCKET_SIZE) - 1
+        self._owner = owner
+        self.worker_id = worker_id
+
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+        # Hits on entries stored by another worker
+        self.cross_worker_hits = 0
+
+    @staticmethod
+    def create(memory_bytes: int) -> SharedTranspositionTable:
+        bucket_count = max(1, memory_bytes // (SharedTranspositionTable.ENTRY_SIZE_BYTES *
+                                               SharedTranspositionTable.BUCKET_SIZE))
+        bucket_count = 1 << (bucket_count.bit_length() - 1)
+        size = bucket_count * SharedTranspositionTable.BUCKET_SIZE * SharedTranspositionTable.ENTRY_SIZE_BYTES
+
+        memory = shared_memory.SharedMemory(create=True, size=size)
+        # Shared memory is not guaranteed to start zeroed on every platform
+        memory.buf[:size] = bytes(size)
+        return SharedTranspositionTable(memory, 0, owner=True)
+
+    @staticmethod
+    def attach(name: str, worker_id: int) -> SharedTranspositionTable:
+        if not 0 <= worker_id <= SharedTranspositionTable.MAX_WORKER_ID:
+            raise ValueError(f"Worker id {worker_id} out of range")
+        return SharedTranspositionTable(shared_memory.SharedMemory(name=name), worker_id, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._memory.name
+
+    @property
+    def capacity(self) -> int:
+        return len(self._words) // 2
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    @property
+    def cross_worker_hit_rate(self) -> float:
+        return self.cross_worker_hits / self.hits if self.hits else 0.0
+
+    def probe(self, key: int) -> TranspositionEntry | None:
+        index = (key & self._mask) * self.BUCKET_SIZE * 2
+        words = self._words
+        occupied = False
+
+        for slot in range(index, index + self.BUCKET_SIZE * 2, 2):
+            check, data = words[slot], words[slot + 1]
+            if data == 0:
+                continue
+            occupied = True
+            if check ^ data != key:
+                continue
+
+            self.hits += 1
+            if (data >> self._WORKER_SHIFT) & self.MAX_WORKER_ID != self.worker_id:
+                self.cross_worker_hits += 1
+            return self._unpack(key, data)
+
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: Bound,
+              best_move: tuple[Position, Position] | None) -> None:
+        index = (key & self._mask) * self.BUCKET_SIZE * 2
+        data = self._pack(depth, score, bound, best_move)
+        words = self._words
+        self.stores += 1
+
+        check, stored_data = words[index], words[index + 1]
+        stored_depth = (stored_data >> self._DEPTH_SHIFT) & 0xFF
+        if stored_data == 0 or check ^ stored_data == key or depth >= stored_depth:
+            slot = index
+        else:
+            slot = index + 2
+
+        words[slot] = key ^ data
+        words[slot + 1] = data
+
+    def clear(self) -> None:
+        self._memory.buf[:len(self._words) * 8] = bytes(len(self._words) * 8)
+        self.hits = self.misses = self.collisions = self.stores = self.cross_worker_hits = 0
+
+    def get_stats(self) -> dict[str, int | float]:
+        return {
+            "capacity": self.capacity,
+            "stores": self.stores,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "cross_worker_hits": self.cross_worker_hits,
+            "hit_rate": self.hit_rate,
+            "cross_worker_hit_rate": self.cross_worker_hit_rate,
+        }
+
+    def close(self) -> None:
+        """
+        Detaches this process, the owner also frees the memory
+        """
+        self._words.release()
+        self._memory.close()
+        if self._owner:
+            self._memory.unlink()
+
+    # region Private methods
+
+    def _pack(self, depth: int, score: int, bound: Bound, best_move: tuple[Position, Position] | None) -> int:
+        if best_move is None:
+            from_square = to_square = self._NO_MOVE
+        else:
+            from_square, to_square = square_index(best_move[0]), square_index(best_move[1])
+
+        return (score + self._SCORE_OFFSET) | \
+            (min(max(depth, 0), 0xFF) << self._DEPTH_SHIFT) | \
+            (bound.value << self._BOUND_SHIFT) | \
+            (from_square << self._FROM_SHIFT) | \
+            (to_square << self._TO_SHIFT) | \
+            (self.worker_id << self._WORKER_SHIFT)
+
+    def _unpack(self, key: int, data: int) -> TranspositionEntry:
+        score = (data & ((1 << self._SCORE_BITS) - 1)) - self._SCORE_OFFSET
+        depth = (data >> self._DEPTH_SHIFT) & 0xFF
+        bound = Bound((data >> self._BOUND_SHIFT) & 0x3)
+        from_square = (data >> self._FROM_SHIFT) & 0x3F
+        to_square = (data >> self._TO_SHIFT) & 0x3F
+
+        best_move = None
+        if from_square != self._NO_MOVE:
+            best_move = (square_position(from_square), square_position(to_square))
+
+        return TranspositionEntry(key, depth, score, bound, best_move)
+
+    # endregion Private methods
@@ -0,0 +1,285 @@
+﻿from __future__ import annotations
+
+import argparse
+import itertools
+import math
+import mmap
+import os
+import time
+from typing import TYPE_CHECKING
+
+from src.model.BitBoard import BitBoard, BOTTOM_ROW, SQUARE_COUNT, TOP_ROW, iter_bits
+from src.model.dataclasses import Outcome, Side, TablebaseResult
+
+if TYPE_CHECKING:
+    from src.model import Game
+
+# Material of a position: (black men, black kings, white men, white kings)
+Signature = tuple[int, int, int, int]
+
+
+def get_signature(bit_board: BitBoard) -> Signature:
+    kings = bit_board.kings
+    return ((bit_board.black & ~kings).bit_count(), (bit_board.black & kings).bit_count(),
+            (bit_board.white & ~kings).bit_count(), (bit_board.white & kings).bit_count())
+
+
+def get_file_name(signature: Signature) -> str:
+    black_men, black_kings, white_men, white_kings = signature
+    return f"{black_men}{black_kings}v{white_men}{white_kings}{Tablebase.FILE_EXTENSION}"
+
+
+def get_table_size(signature: Signature) -> int:
+    return math.prod(math.comb(SQUARE_COUNT, count) for count in signature) * 2
+
+
+def get_index(bit_board: BitBoard, signature: Signature) -> int:
+    """
+    :return: position of the entry in the table of the signature, each piece set is ranked on its own
+    """
+    kings = bit_board.kings
+    index = 0
+    for pieces, count in zip((bit_board.black & ~kings, bit_board.black & kings,
+                              bit_board.white & ~kings, bit_board.white & kings), signature):
+        index = index * math.comb(SQUARE_COUNT, count) + _rank(pieces)
+
+    return index * 2 + (0 if bit_board.side_to_move == Side.BLACK else 1)
+
+
+def _rank(pieces: int) -> int:
+    # Combinatorial number system, a unique number below comb(SQUARE_COUNT, count) for every set of fields
+    result = 0
+    for count, bit in enumerate(iter_bits(pieces), start=1):
+        result += math.comb(bit.bit_length() - 1, count)
+    return result
+
+
+def _decode(value: int) -> TablebaseResult:
+    if value == 0:
+        return TablebaseResult(Outcome.DRAW, 0)
+    if value < 128:
+        return TablebaseResult(Outcome.WIN, value)
+    return TablebaseResult(Outcome.LOSS, 255 - value)
+
+
+def _encode(result: TablebaseResult) -> int:
+    if result.outcome == Outcome.WIN:
+        return result.distance
+    if result.outcome == Outcome.LOSS:
+        return 255 - result.distance
+    return 0
+
+
+class Tablebase:
+    """
+    Perfect play results of endgames with few pieces, one file per material signature, opened with mmap.
+    Every file has a byte per position and side to move: n in 1..127 is a win in n plies,
+    255 - n a loss in n plies and 0 a draw.
+    """
+    FILE_EXTENSION = ".tb"
+    # Next to the src package, independent of the working directory
+    DEFAULT_FOLDER = os.path.normpath(os.path.join(os.path.dirname(__file__), os.pardir, os.pardir, "tablebase"))
+    MAX_DISTANCE = 126
+
+    def __init__(self, folder: str = DEFAULT_FOLDER):
+        self.folder = folder
+        self._files: dict[Signature, tuple] = {}
+        self.max_pieces = 0
+
+        if os.path.isdir(folder):
+            for file_name in os.listdir(folder):
+                if file_name.endswith(self.FILE_EXTENSION):
+                    pieces = sum(int(char) for char in file_name[:-len(self.FILE_EXTENSION)] if char.isdigit())
+                    self.max_pieces = max(self.max_pieces, pieces)
+
+    def probe(self, game: Game) -> TablebaseResult | None:
+        """
+        :return: result for the side to move, None if the position is not in the tablebase
+        """
+        if game.board.count_pieces(Side.BLACK) + game.board.count_pieces(Side.WHITE) > self.max_pieces:
+            return None
+        return self.probe_bit_board(BitBoard.from_game(game))
+
+    def probe_bit_board(self, bit_board: BitBoard) -> TablebaseResult | None:
+        signature = get_signature(bit_board)
+        table = self._get_table(signature)
+        if table is None:
+            return None
+        return _decode(table[get_index(bit_board, signature)])
+
+    def adjudicate(self, game: Game) -> Side | None:
+        """
+        Like Game.get_winner, but for positions the tablebase knows: the side that wins with perfect play
+        """
+        result = self.probe(game)
+        if result is None or result.outcome == Outcome.DRAW:
+            return None
+        return game.side_to_move if result.outcome == Outcome.WIN else game.side_to_move.get_enemy()
+
+    def close(self) -> None:
+        for file, table in self._files.values():
+            if table is not None:
+                table.close()
+                file.close()
+        self._files.clear()
+
+    @staticmethod
+    def generate(folder: str, max_pieces: int, log=print) -> None:
+        """
+        Solves every position with up to max_pieces pieces by retrograde analysis and writes the tables
+        """
+        os.makedirs(folder, exist_ok=True)
+        tables: dict[Signature, bytearray] = {}
+
+        # Captures lead to fewer pieces and promotions to fewer men, so those tables are solved first
+        signatures = [signature for signature in itertools.product(range(max_pieces + 1), repeat=4)
+                      if sum(signature) <= max_pieces and signature[0] + signature[1] > 0
+                      and signature[2] + signature[3] > 0]
+        signatures.sort(key=lambda signature: (sum(signature), signature[0] + signature[2]))
+
+        for signature in signatures:
+            start_time = time.perf_counter()
+            tables[signature] = _solve(signature, tables)
+            with open(os.path.join(folder, get_file_name(signature)), "wb") as f:
+                f.write(tables[signature])
+            log(f"{get_file_name(signature)}: {len(tables[signature])} entries "
+                f"in {time.perf_counter() - start_time:.1f} s")
+
+    # region Private methods
+
+    def _get_table(self, signature: Signature):
+        if signature not in self._files:
+            path = os.path.join(self.folder, get_file_name(signature))
+            if os.path.exists(path):
+                file = open(path, "rb")
+                self._files[signature] = (file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ))
+            else:
+                self._files[signature] = (None, None)
+
+        return self._files[signature][1]
+
+    # endregion Private methods
+
+
+def _iter_piece_sets(squares: list[int], count: int, taken: int):
+    for combination in itertools.combinations([square for square in squares if not taken & (1 << square)], count):
+        yield sum(1 << square for square in combination)
+
+
+def _iter_positions(signature: Signature):
+    black_men, black_kings, white_men, white_kings = signature
+    squares = list(range(SQUARE_COUNT))
+    # Men standing on their promotion row would already be kings
+    black_men_squares = [square for square in squares if not BOTTOM_ROW & (1 << square)]
+    white_men_squares = [square for square in squares if not TOP_ROW & (1 << square)]
+
+    for black_men_set in _iter_piece_sets(black_men_squares, black_men, 0):
+        for black_kings_set in _iter_piece_sets(squares, black_kings, black_men_set):
+            black = black_men_set | black_kings_set
+            for white_men_set in _iter_piece_sets(white_men_squares, white_men, black):
+                for white_kings_set in _iter_piece_sets(squares, white_kings, black | white_men_set):
+                    for side in (Side.BLACK, Side.WHITE):
+                        yield BitBoard(black, white_men_set | white_kings_set, black_kings_set | white_kings_set, side)
+
+
+def _solve(signature: Signature, solved: dict[Signature, bytearray]) -> bytearray:
+    """
+    Retrograde analysis: positions decided by the moves into other tables are the seeds, every newly decided
+    position then decides its predecessors in this table, shortest distances first
+    """
+    table = bytearray(get_table_size(signature))
+    is_solved = bytearray(len(table))
+
+    # Predecessors in this table: child index -> indexes of the positions with a move to it
+    parents: dict[int, list[int]] = {}
+    # Per position that can still lose: children in this table not known to be won yet, longest win among
+    # the children in this table and in other tables, whether one of the children in other tables is a draw
+    remaining_children: dict[int, int] = {}
+    longest_wins: dict[int, int] = {}
+    has_draws: set[int] = set()
+    # Distance -> positions decided in that many plies: (index, outcome), lower distances are handled first
+    queue: dict[int, list[tuple[int, Outcome]]] = {}
+
+    for bit_board in _iter_positions(signature):
+        index = get_index(bit_board, signature)
+        moves = bit_board.get_all_valid_moves(bit_board.side_to_move)
+
+        # No valid moves => the side to move has lost
+        if not moves:
+            queue.setdefault(0, []).append((index, Outcome.LOSS))
+            continue
+
+        children = 0
+        shortest_loss: int | None = None
+        longest_win = 0
+        for move in moves:
+            child = bit_board.apply_move(move)
+            child_signature = get_signature(child)
+
+            if child_signature == signature:
+                parents.setdefault(get_index(child, signature), []).append(index)
+                children += 1
+                continue
+
+            # All enemy pieces taken => the enemy has lost
+            if not child.get_pieces(child.side_to_move):
+                result = TablebaseResult(Outcome.LOSS, 0)
+            else:
+                result = _decode(solved[child_signature][get_index(child, child_signature)])
+
+            if result.outcome == Outcome.LOSS:
+                shortest_loss = result.distance if shortest_loss is None else min(shortest_loss, result.distance)
+            elif result.outcome == Outcome.WIN:
+                longest_win = max(longest_win, result.distance)
+            else:
+                has_draws.add(index)
+
+        # Some move leaves the enemy in a lost position, this table can at most make the win shorter
+        if shortest_loss is not None:
+            queue.setdefault(shortest_loss + 1, []).append((index, Outcome.WIN))
+            continue
+
+        # Every move leaves the enemy in a won position
+        if children == 0 and index not in has_draws:
+            queue.setdefault(longest_win + 1, []).append((index, Outcome.LOSS))
+        remaining_children[index] = children
+        longest_wins[index] = longest_win
+
+    distance = 0
+    while queue:
+        while distance not in queue:
+            distance += 1
+        for index, outcome in queue.pop(distance):
+            # A win can be queued by several children, the first one is the shortest
+            if is_solved[index]:
+                continue
+            if distance > Tablebase.MAX_DISTANCE:
+                raise ValueError(f"Distance over {Tablebase.MAX_DISTANCE} plies in {get_file_name(signature)}")
+
+            table[index] = _encode(TablebaseResult(outcome, distance))
+            is_solved[index] = 1
+
+            for parent in parents.get(index, ()):
+                if is_solved[parent]:
+                    continue
+                if outcome == Outcome.LOSS:
+                    queue.setdefault(distance + 1, []).append((parent, Outcome.WIN))
+                    continue
+                if parent not in remaining_children:
+                    continue
+
+                remaining_children[parent] -= 1
+                longest_wins[parent] = max(longest_wins[parent], distance)
+                if remaining_children[parent] == 0 and parent not in has_draws:
+                    queue.setdefault(longest_wins[parent] + 1, []).append((parent, Outcome.LOSS))
+
+    # Whatever is left can't be forced either way, its entries stay 0 (draw)
+    return table
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Generates endgame tablebase files")
+    parser.add_argument("--pieces", type=int, default=3, help="maximal number of pieces on the board")
+    parser.add_argument("--folder", default=Tablebase.DEFAULT_FOLDER)
+    args = parser.parse_args()
+    Tablebase.generate(args.folder, args.pieces)
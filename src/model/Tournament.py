@@ -0,0 +1,187 @@
+﻿from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.model import Engine, Game, Tablebase
+from src.model.BitBoard import square_index, square_position
+from src.model.dataclasses import EvaluationWeights, PlayerConfig, Side, TournamentResult
+
+# Tablebase of the worker process, opened for its first game
+_tablebase: Tablebase | None = None
+
+
+def _get_tablebase() -> Tablebase:
+    global _tablebase
+    if _tablebase is None:
+        _tablebase = Tablebase()
+    return _tablebase
+
+
+# Random openings drawn per needed opening before giving up on finding distinct ones
+MAX_OPENING_ATTEMPTS = 100
+
+
+def _create_engine(config: PlayerConfig) -> Engine | None:
+    if config.depth is None and config.time_limit_ms is None:
+        return None
+    return Engine(max_depth=config.depth, time_limit_ms=config.time_limit_ms, weights=config.weights)
+
+
+def get_random_opening(rng: random.Random, plies: int) -> list[tuple[int, int]]:
+    """
+    :return: random moves from the initial position as (from square, to square), shorter if the game ends sooner
+    """
+    game = Game()
+    result: list[tuple[int, int]] = []
+    for _ in range(plies):
+        moves = game.get_all_valid_moves(game.side_to_move)
+        if not moves:
+            break
+        move = rng.choice(moves)
+        result.append((square_index(move.from_piece.position), square_index(move.to_position)))
+        game.make(move)
+    return result
+
+
+def get_distinct_openings(rng: random.Random, count: int, plies: int) -> list[list[tuple[int, int]]]:
+    """
+    :return: random openings that all lead to different positions, transpositions count as the same opening
+    """
+    result: list[list[tuple[int, int]]] = []
+    seen_keys: set[int] = set()
+    for _ in range(count * MAX_OPENING_ATTEMPTS):
+        if len(result) == count:
+            break
+
+        opening = get_random_opening(rng, plies)
+        game = Game()
+        for from_square, to_square in opening:
+            game.make(game.find_move(square_position(from_square), square_position(to_square)))
+        if game.zobrist_key not in seen_keys:
+            seen_keys.add(game.zobrist_key)
+            result.append(opening)
+
+    if len(result) < count:
+        raise ValueError(f"Only {len(result)} distinct openings of {plies} plies found, {count} needed")
+    return result
+
+
+def play_game(black: PlayerConfig, white: PlayerConfig, opening: list[tuple[int, int]],
+              max_moves: int) -> tuple[Side | None, dict[Side, float], dict[Side, int]]:
+    """
+    Plays the opening moves, then lets the players move until someone wins or max_moves plies were played.
+    Solved endgames are adjudicated with the tablebase in Tablebase.DEFAULT_FOLDER, if it was generated.
+    :return: winner (None for a draw), milliseconds spent and moves made per side
+    """
+    game = Game()
+    game.engine = None
+    game.tablebase = _get_tablebase()
+    engines = {Side.BLACK: _create_engine(black), Side.WHITE: _create_engine(white)}
+    move_ms = dict.fromkeys(engines, 0.0)
+    move_counts = dict.fromkeys(engines, 0)
+
+    for from_square, to_square in opening:
+        game.make(game.find_move(square_position(from_square), square_position(to_square)))
+
+    for _ in range(max_moves):
+        winner = game.get_winner()
+        if winner is not None:
+            return winner, move_ms, move_counts
+
+        side = game.side_to_move
+        start_time = time.perf_counter()
+        game.engine = engines[side]
+        game.make_best_move()
+        move_ms[side] += (time.perf_counter() - start_time) * 1000
+        move_counts[side] += 1
+
+    return game.get_winner(), move_ms, move_counts
+
+
+class Tournament:
+    """
+    Plays games between two players over a pool of worker processes.
+    The random openings lead to different positions, so no game is repeated. Every opening is played twice
+    with swapped colors, so neither player profits from a lucky opening.
+    """
+    DEFAULT_OPENING_PLIES = 4
+    # Plies after which the game counts as a draw
+    DEFAULT_MAX_MOVES = 200
+
+    def __init__(self, workers: int | None = None):
+        self.workers = workers
+
+    def run(self, first: PlayerConfig, second: PlayerConfig, games: int,
+            opening_plies: int = DEFAULT_OPENING_PLIES, max_moves: int = DEFAULT_MAX_MOVES,
+            seed: int = 0, log=None) -> TournamentResult:
+        """
+        :param games: rounded up to an even number, each opening is played from both sides
+        """
+        rng = random.Random(seed)
+        openings = get_distinct_openings(rng, (games + 1) // 2, opening_plies)
+        result = TournamentResult(first, second)
+
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            futures = []
+            for opening in openings:
+                futures.append((Side.BLACK, executor.submit(play_game, first, second, opening, max_moves)))
+                futures.append((Side.WHITE, executor.submit(play_game, second, first, opening, max_moves)))
+
+            for first_side, future in futures:
+                winner, move_ms, move_counts = future.result()
+                self._add_game(result, first_side, winner, move_ms, move_counts)
+                if log is not None:
+                    log(result)
+
+        return result
+
+    # region Private methods
+
+    @staticmethod
+    def _add_game(result: TournamentResult, first_side: Side, winner: Side | None, move_ms: dict[Side, float],
+                  move_counts: dict[Side, int]) -> None:
+        if winner is None:
+            result.draws += 1
+        elif winner == first_side:
+            result.wins += 1
+        else:
+            result.losses += 1
+
+        second_side = first_side.get_enemy()
+        result.first_move_ms += move_ms[first_side]
+        result.first_moves += move_counts[first_side]
+        result.second_move_ms += move_ms[second_side]
+        result.second_moves += move_counts[second_side]
+
+    # endregion Private methods
+
+
+def _parse_player(text: str) -> PlayerConfig:
+    """
+    :param text: "heuristic" or "depth=4", "time=200", "man=100", "king=160", ... separated by commas
+    """
+    if text == "heuristic":
+        return PlayerConfig(text)
+
+    options = dict(option.split("=") for option in text.split(","))
+    depth = int(options.pop("depth")) if "depth" in options else None
+    time_limit_ms = float(options.pop("time")) if "time" in options else None
+    weights = EvaluationWeights(**{name: int(value) for name, value in options.items()})
+    return PlayerConfig(text, depth, time_limit_ms, weights)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Plays engine vs engine games and reports the Elo difference")
+    parser.add_argument("first", type=_parse_player, help='"heuristic" or options like "depth=4,king=150"')
+    parser.add_argument("second", type=_parse_player)
+    parser.add_argument("--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--opening-plies", type=int, default=Tournament.DEFAULT_OPENING_PLIES)
+    parser.add_argument("--max-moves", type=int, default=Tournament.DEFAULT_MAX_MOVES)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    print(Tournament(args.workers).run(args.first, args.second, args.games, args.opening_plies, args.max_moves,
+                                       args.seed))
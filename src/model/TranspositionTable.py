@@ -0,0 +1,91 @@
+﻿from __future__ import annotations
+
+from typing import NamedTuple
+
+from src.model.dataclasses import Bound, Position
+
+
+class TranspositionEntry(NamedTuple):
+    key: int
+    depth: int
+    score: int
+    bound: Bound
+    # (from position, to position) of the best move found, None if there was no move
+    best_move: tuple[Position, Position] | None
+
+
+class TranspositionTable:
+    """
+    Fixed-size cache of search results keyed by Game.zobrist_key.
+    Every bucket has a depth-preferred slot and an always-replace slot.
+    """
+    # Rough size of one stored entry (tuple, ints and the move tuple), used to turn the memory cap into a size
+    ENTRY_SIZE_BYTES = 200
+    BUCKET_SIZE = 2
+    DEFAULT_MEMORY_BYTES = 16 * 1024 * 1024
+
+    def __init__(self, memory_bytes: int = DEFAULT_MEMORY_BYTES):
+        bucket_count = max(1, memory_bytes // (self.ENTRY_SIZE_BYTES * self.BUCKET_SIZE))
+        # Round down to a power of two, so the bucket is just the low bits of the key
+        bucket_count = 1 << (bucket_count.bit_length() - 1)
+
+        self._mask = bucket_count - 1
+        self._entries: list[TranspositionEntry | None] = [None] * (bucket_count * self.BUCKET_SIZE)
+
+        self.hits = 0
+        self.misses = 0
+        # Misses where the bucket was taken by other positions
+        self.collisions = 0
+        self.stores = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._entries)
+
+    @property
+    def hit_rate(self) -> float:
+        probes = self.hits + self.misses
+        return self.hits / probes if probes else 0.0
+
+    def probe(self, key: int) -> TranspositionEntry | None:
+        index = (key & self._mask) * self.BUCKET_SIZE
+        depth_preferred = self._entries[index]
+        always_replace = self._entries[index + 1]
+
+        if depth_preferred is not None and depth_preferred.key == key:
+            self.hits += 1
+            return depth_preferred
+        if always_replace is not None and always_replace.key == key:
+            self.hits += 1
+            return always_replace
+
+        self.misses += 1
+        if depth_preferred is not None or always_replace is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key: int, depth: int, score: int, bound: Bound,
+              best_move: tuple[Position, Position] | None) -> None:
+        index = (key & self._mask) * self.BUCKET_SIZE
+        entry = TranspositionEntry(key, depth, score, bound, best_move)
+        self.stores += 1
+
+        depth_preferred = self._entries[index]
+        if depth_preferred is None or depth_preferred.key == key or depth >= depth_preferred.depth:
+            self._entries[index] = entry
+        else:
+            self._entries[index + 1] = entry
+
+    def clear(self) -> None:
+        self._entries = [None] * len(self._entries)
+        self.hits = self.misses = self.collisions = self.stores = 0
+
+    def get_stats(self) -> dict[str, int | float]:
+        return {
+            "capacity": self.capacity,
+            "stores": self.stores,
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "hit_rate": self.hit_rate,
+        }
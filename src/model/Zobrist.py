@@ -0,0 +1,40 @@
+﻿from __future__ import annotations
+
+import random
+
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses.Position import Position
+from src.model.dataclasses.Side import Side
+
+# Fixed seed, so keys are the same in every process and can be stored
+_random = random.Random(0x5EED_C4EC)
+
+# PIECE_KEYS[side][is_king][position] -> random 64-bit key of that piece standing on that field
+PIECE_KEYS: dict[Side, dict[bool, dict[Position, int]]] = {
+    side: {
+        is_king: {Position.at(row, column): _random.getrandbits(64)
+                  for row in range(BOARD_SIZE) for column in range(BOARD_SIZE)}
+        for is_king in (False, True)
+    }
+    for side in Side
+}
+# Mixed in when white is to move
+WHITE_TO_MOVE_KEY = _random.getrandbits(64)
+
+
+def get_piece_key(piece) -> int:
+    return PIECE_KEYS[piece.side][piece.is_king][piece.position]
+
+
+def get_side_key(side: Side) -> int:
+    return WHITE_TO_MOVE_KEY if side == Side.WHITE else 0
+
+
+def compute_key(pieces, side_to_move: Side) -> int:
+    """
+    :return: key computed from scratch, the incrementally updated keys must always match it
+    """
+    key = get_side_key(side_to_move)
+    for piece in pieces:
+        key ^= get_piece_key(piece)
+    return key
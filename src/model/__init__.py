@@ -1,3 +1,13 @@
 ﻿from .Board import Board
+from .BitBoard import BitBoard, BitMove
 from .SaveParser import SaveParser, SaveResult
+from .TranspositionTable import TranspositionTable, TranspositionEntry
+from .SharedTranspositionTable import SharedTranspositionTable
+from .Tablebase import Tablebase
+from .MoveOrderer import MoveOrderer
+from .BatchEvaluator import BatchEvaluator
+from .Engine import Engine
 from .Game import Game
+from .OpeningBook import OpeningBook
+from .ParallelSearch import ParallelSearch
+from .Tournament import Tournament
@@ -0,0 +1,12 @@
+﻿from enum import Enum
+
+
+class Bound(Enum):
+    """
+    How a stored search score relates to the real score of the position
+    """
+    EXACT = 0
+    # Real score is at least the stored one (the search failed high)
+    LOWER = 1
+    # Real score is at most the stored one (the search failed low)
+    UPPER = 2
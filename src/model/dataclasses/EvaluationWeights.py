@@ -0,0 +1,13 @@
+﻿from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class EvaluationWeights:
+    man: int = 100
+    king: int = 160
+    # Per row a man has advanced from its own back row
+    advancement: int = 3
+    # Per man still guarding its own back row against enemy promotions
+    back_rank: int = 8
+    # Per simple step to an empty field, off by default since counting the steps slows down every evaluation
+    mobility: int = 0
@@ -0,0 +1,10 @@
+﻿from enum import Enum
+
+
+class Outcome(Enum):
+    """
+    Result of a position for the side to move, with perfect play from both sides
+    """
+    WIN = 1
+    LOSS = 2
+    DRAW = 3
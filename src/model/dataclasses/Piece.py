@@ -1,5 +1,6 @@
 ﻿from dataclasses import dataclass
 
+from src.model import MoveTables
 from src.model.constants import BOARD_SIZE
 from src.model.dataclasses import Position
 from src.model.dataclasses.Side import Side
@@ -20,29 +21,10 @@ class Piece:
         """
         :return: list of all positions 1 or 2 fields away from the piece
         """
-        result: list[Position] = []
-        jump_length = 2 if long_jump else 1
+        if long_jump:
+            return [landing for _, landing in MoveTables.get_jumps(self)]
 
-        directions: tuple[tuple[int, int], ...] = ()
-
-        if self.is_king:
-            directions = ((jump_length, jump_length),
-                          (jump_length, -jump_length),
-                          (-jump_length, jump_length),
-                          (-jump_length, -jump_length))
-        elif self.side == Side.WHITE:
-            directions = ((-jump_length, jump_length),
-                          (-jump_length, -jump_length))
-        elif self.side == Side.BLACK:
-            directions = ((jump_length, jump_length),
-                          (jump_length, -jump_length))
-
-        for row, column in directions:
-            position = Position(self.position.row + row, self.position.column + column)
-            if 0 <= position.row < BOARD_SIZE and 0 <= position.column < BOARD_SIZE:
-                result.append(position)
-
-        return result
+        return list(MoveTables.get_steps(self))
 
     def distance_from_edge(self) -> int:
         if self.side == Side.WHITE:
@@ -55,7 +37,7 @@ class Piece:
     def get_from_string(string: str) -> "Piece":
         side = Side.WHITE if string[0] == Piece.WHITE or string[0] == Piece.WHITE_KING else Side.BLACK
         is_king = string[0] == Piece.WHITE_KING or string[0] == Piece.BLACK_KING
-        position = Position(int(string[1]), int(string[2]))
+        position = Position.at(int(string[1]), int(string[2]))
         return Piece(side, position, is_king)
 
     def __hash__(self):
@@ -0,0 +1,14 @@
+﻿from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from src.model.dataclasses import EvaluationWeights
+
+
+@dataclass(frozen=True)
+class PlayerConfig:
+    name: str
+    # None plays the one move heuristic of Game.get_best_move
+    depth: int | None = None
+    time_limit_ms: float | None = None
+    weights: EvaluationWeights = field(default_factory=EvaluationWeights)
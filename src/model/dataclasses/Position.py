@@ -1,13 +1,46 @@
-﻿from dataclasses import dataclass
+﻿from __future__ import annotations
 
+from dataclasses import dataclass
+from typing import ClassVar
 
-@dataclass
+from src.model.constants import BOARD_SIZE
+
+
+@dataclass(frozen=True, eq=False)
 class Position:
+    __slots__ = ("row", "column")
+
     row: int
     column: int
 
+    # Shared instances of every field on the board, see Position.at
+    _FIELDS: ClassVar[tuple[tuple[Position, ...], ...]] = ()
+
+    @staticmethod
+    def at(row: int, column: int) -> Position:
+        """
+        :return: the shared instance for a field on the board, a new one for anything outside it
+        """
+        if 0 <= row < BOARD_SIZE and 0 <= column < BOARD_SIZE:
+            return Position._FIELDS[row][column]
+
+        return Position(row, column)
+
+    def __eq__(self, other):
+        if self is other:
+            return True
+        if not isinstance(other, Position):
+            return NotImplemented
+        return self.row == other.row and self.column == other.column
+
     def __hash__(self):
-        return hash((self.row, self.column))
+        return self.row * BOARD_SIZE + self.column
+
+    def __reduce__(self):
+        return Position.at, (self.row, self.column)
 
     def __str__(self):
         return f"{self.row}{self.column}"
+
+
+Position._FIELDS = tuple(tuple(Position(row, column) for column in range(BOARD_SIZE)) for row in range(BOARD_SIZE))
@@ -0,0 +1,20 @@
+﻿from __future__ import annotations
+
+from dataclasses import dataclass, field
+
+from src.model.dataclasses import Move, SearchStats
+
+
+@dataclass
+class SearchResult:
+    # None if the side to move has no valid move
+    move: Move | None
+    # From the point of view of the side to move
+    score: int
+    # Deepest fully searched depth
+    depth: int
+    nodes: int = 0
+    elapsed_ms: float = 0.0
+    principal_variation: list[Move] = field(default_factory=list)
+    # Only filled in when the engine collects stats
+    stats: SearchStats | None = None
@@ -0,0 +1,51 @@
+﻿from __future__ import annotations
+
+import json
+from dataclasses import dataclass, field
+
+from src.model.dataclasses import Move
+
+
+@dataclass
+class SearchStats:
+    """
+    How an AI move was found, see Engine.collect_stats
+    """
+    # "engine", "book" or "ponder" (an engine search made during the human's turn)
+    source: str = "engine"
+    nodes: int = 0
+    # Deepest fully searched depth
+    depth: int = 0
+    elapsed_ms: float = 0.0
+    table_hits: int = 0
+    table_probes: int = 0
+    cutoffs: int = 0
+    first_move_cutoffs: int = 0
+    move_generation_ms: float = 0.0
+    evaluation_ms: float = 0.0
+    principal_variation: list[Move] = field(default_factory=list)
+
+    @property
+    def nodes_per_second(self) -> float:
+        return self.nodes / self.elapsed_ms * 1000 if self.elapsed_ms > 0 else 0.0
+
+    def to_log_line(self) -> str:
+        """
+        :return: the stats as one line of JSON, moves written as "21-32" (from row and column - to row and column)
+        """
+        return json.dumps({
+            "source": self.source,
+            "nodes": self.nodes,
+            "nps": round(self.nodes_per_second),
+            "depth": self.depth,
+            "elapsed_ms": round(self.elapsed_ms, 3),
+            "table_hits": self.table_hits,
+            "table_probes": self.table_probes,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoffs": self.first_move_cutoffs,
+            "move_generation_ms": round(self.move_generation_ms, 3),
+            "evaluation_ms": round(self.evaluation_ms, 3),
+            "principal_variation": [f"{move.from_piece.position.row}{move.from_piece.position.column}-"
+                                    f"{move.to_position.row}{move.to_position.column}"
+                                    for move in self.principal_variation],
+        })
@@ -0,0 +1,10 @@
+﻿from dataclasses import dataclass
+
+from src.model.dataclasses import Outcome
+
+
+@dataclass(frozen=True)
+class TablebaseResult:
+    outcome: Outcome
+    # Plies until the game is won or lost, 0 for draws
+    distance: int
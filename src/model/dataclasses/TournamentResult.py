@@ -0,0 +1,78 @@
+﻿from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+
+from src.model.dataclasses import PlayerConfig
+
+
+@dataclass
+class TournamentResult:
+    """
+    Wins, draws and losses are from the point of view of the first player
+    """
+    first: PlayerConfig
+    second: PlayerConfig
+    wins: int = 0
+    draws: int = 0
+    losses: int = 0
+    first_move_ms: float = 0.0
+    first_moves: int = 0
+    second_move_ms: float = 0.0
+    second_moves: int = 0
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def score(self) -> float:
+        """
+        :return: points of the first player per game, a draw is half a point
+        """
+        return (self.wins + self.draws / 2) / self.games if self.games else 0.5
+
+    @property
+    def elo(self) -> float:
+        """
+        :return: Elo difference of the first player against the second one
+        """
+        return self._get_elo(self.score)
+
+    @property
+    def elo_error(self) -> float:
+        """
+        :return: half the width of the 95% confidence interval of elo
+        """
+        if not self.games:
+            return math.inf
+
+        score = self.score
+        variance = (self.wins * (1 - score) ** 2 + self.draws * (0.5 - score) ** 2 + self.losses * score ** 2) / self.games
+        margin = 1.96 * math.sqrt(variance / self.games)
+        return (self._get_elo(score + margin) - self._get_elo(score - margin)) / 2
+
+    @property
+    def first_ms_per_move(self) -> float:
+        return self.first_move_ms / self.first_moves if self.first_moves else 0.0
+
+    @property
+    def second_ms_per_move(self) -> float:
+        return self.second_move_ms / self.second_moves if self.second_moves else 0.0
+
+    def __str__(self):
+        return (f"{self.first.name} vs {self.second.name}: +{self.wins} ={self.draws} -{self.losses} "
+                f"({self.games} games), Elo {self.elo:+.1f} ± {self.elo_error:.1f}, "
+                f"{self.first_ms_per_move:.1f} / {self.second_ms_per_move:.1f} ms per move")
+
+    # region Private methods
+
+    @staticmethod
+    def _get_elo(score: float) -> float:
+        if score <= 0:
+            return -math.inf
+        if score >= 1:
+            return math.inf
+        return -400 * math.log10(1 / score - 1)
+
+    # endregion Private methods
@@ -0,0 +1,14 @@
+﻿from typing import NamedTuple
+
+from src.model.dataclasses import Piece, Position, Side
+
+
+class UndoRecord(NamedTuple):
+    """
+    Everything Game.unmake needs to take back a move made with Game.make
+    """
+    piece: Piece
+    from_position: Position
+    captured_pieces: list[Piece]
+    promoted: bool
+    side_to_move: Side
@@ -3,3 +3,12 @@ from .Position import Position
 from .Piece import Piece
 from .Side import Side
 from .Move import Move
+from .UndoRecord import UndoRecord
+from .Bound import Bound
+from .EvaluationWeights import EvaluationWeights
+from .SearchStats import SearchStats
+from .SearchResult import SearchResult
+from .Outcome import Outcome
+from .TablebaseResult import TablebaseResult
+from .PlayerConfig import PlayerConfig
+from .TournamentResult import TournamentResult
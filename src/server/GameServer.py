@@ -0,0 +1,235 @@
+﻿from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from src.model import Engine, Game
+from src.model.BitBoard import square_index, square_position
+from src.model.dataclasses import Position, Side
+from src.server import GameSession
+
+# Engine of the worker process, kept between AI moves so its transposition table is reused
+_worker_engine: Engine | None = None
+
+
+def _init_worker(max_depth: int | None, time_limit_ms: float | None) -> None:
+    global _worker_engine
+    _worker_engine = Engine(max_depth=max_depth, time_limit_ms=time_limit_ms)
+
+
+def _search_best_move(position: tuple[int, int, int, int]) -> tuple[int, int] | None:
+    """
+    :return: (from square, to square) of the best move, None if the side to move has no move
+    """
+    move = _worker_engine.search(Game.from_position(position)).move
+    if move is None:
+        return None
+    return square_index(move.from_piece.position), square_index(move.to_position)
+
+
+def _get_position(request: dict, name: str) -> Position:
+    try:
+        row, column = request[name]
+        return Position.at(int(row), int(column))
+    except (KeyError, TypeError, ValueError, OverflowError):
+        raise ValueError(f'"{name}" has to be [row, column]')
+
+
+class GameServer:
+    """
+    Hosts many games over one TCP connection per client. Every request and response is a JSON object on its own line:
+    {"id": 1, "command": "move", "session": 3, "from": [2, 1], "to": [3, 0]} -> {"id": 1, "ok": true, ...}
+    AI moves are searched in a process pool, so they never block the event loop.
+    """
+    DEFAULT_HOST = "127.0.0.1"
+    DEFAULT_PORT = 8765
+
+    def __init__(self, workers: int | None = None, ai_max_depth: int | None = None,
+                 ai_time_limit_ms: float | None = Game.AI_TIME_LIMIT_MS):
+        self.sessions: dict[int, GameSession] = {}
+        self._next_session_id = 1
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                             initargs=(ai_max_depth, ai_time_limit_ms))
+        self._server: asyncio.Server | None = None
+        # Task handling each open client connection -> its writer
+        self._connections: dict[asyncio.Task, asyncio.StreamWriter] = {}
+        self._commands = {
+            "new": self._new,
+            "select": self._select,
+            "move": self._move,
+            "state": self._state,
+            "ai_move": self._ai_move,
+            "close": self._close_session,
+            "stats": self._stats,
+        }
+
+        self.requests = 0
+        self.ai_moves = 0
+        self.ai_move_ms = 0.0
+
+    @property
+    def port(self) -> int | None:
+        if self._server is None:
+            return None
+        return self._server.sockets[0].getsockname()[1]
+
+    async def start(self, host: str = DEFAULT_HOST, port: int = DEFAULT_PORT) -> None:
+        self._server = await asyncio.start_server(self._handle_connection, host, port)
+
+    async def serve_forever(self) -> None:
+        await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections.values():
+                writer.close()
+            tasks = list(self._connections)
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            await self._server.wait_closed()
+        self._executor.shutdown(cancel_futures=True)
+
+    async def handle_request(self, request: dict) -> dict:
+        """
+        :return: response to one request, errors are reported as {"ok": false, "error": ...}
+        """
+        self.requests += 1
+        response = {"id": request.get("id")} if isinstance(request, dict) and "id" in request else {}
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request has to be a JSON object")
+            command_name = request.get("command")
+            command = self._commands.get(command_name) if isinstance(command_name, str) else None
+            if command is None:
+                raise ValueError(f"Unknown command {request.get('command')!r}")
+
+            response.update(await command(request))
+            response["ok"] = True
+        except ValueError as e:
+            response.update(ok=False, error=str(e))
+
+        return response
+
+    # region Private methods
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                except json.JSONDecodeError:
+                    response = {"ok": False, "error": "Invalid JSON"}
+                else:
+                    response = await self.handle_request(request)
+
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            del self._connections[task]
+            writer.close()
+
+    def _get_session(self, request: dict) -> GameSession:
+        session_id = request.get("session")
+        # bool is an int subclass, true must not mean session 1
+        session = self.sessions.get(session_id) if type(session_id) is int else None
+        if session is None:
+            raise ValueError(f"Unknown session {request.get('session')!r}")
+        session.requests += 1
+        return session
+
+    async def _new(self, request: dict) -> dict:
+        ai_side = request.get("ai_side")
+        if ai_side is not None and (not isinstance(ai_side, str) or ai_side not in Side.__members__):
+            raise ValueError(f"Unknown side {ai_side!r}")
+
+        session = GameSession(self._next_session_id, Side[ai_side] if ai_side is not None else None)
+        self.sessions[session.session_id] = session
+        self._next_session_id += 1
+        return session.get_state()
+
+    async def _select(self, request: dict) -> dict:
+        session = self._get_session(request)
+        async with session.lock:
+            moves = session.game.select_piece(_get_position(request, "position"))
+        return {"moves": [[position.row, position.column] for position in moves]}
+
+    async def _move(self, request: dict) -> dict:
+        session = self._get_session(request)
+        async with session.lock:
+            move = session.game.find_move(_get_position(request, "from"), _get_position(request, "to"))
+            if move is None:
+                raise ValueError("Invalid move")
+            session.game.board.selected = None
+            session.game.apply_move(move)
+            return session.get_state()
+
+    async def _state(self, request: dict) -> dict:
+        session = self._get_session(request)
+        async with session.lock:
+            return session.get_state()
+
+    async def _ai_move(self, request: dict) -> dict:
+        session = self._get_session(request)
+        async with session.lock:
+            start_time = time.perf_counter()
+            loop = asyncio.get_running_loop()
+            move = await loop.run_in_executor(self._executor, _search_best_move, session.game.get_position())
+            self.ai_moves += 1
+            self.ai_move_ms += (time.perf_counter() - start_time) * 1000
+
+            if move is not None:
+                session.game.apply_move(session.game.find_move(square_position(move[0]), square_position(move[1])))
+            return session.get_state()
+
+    async def _close_session(self, request: dict) -> dict:
+        session = self._get_session(request)
+        async with session.lock:
+            self.sessions.pop(session.session_id, None)
+        return {"session": session.session_id}
+
+    async def _stats(self, request: dict) -> dict:
+        if "session" in request:
+            session = self._get_session(request)
+            return {"session": session.session_id, "memory_bytes": session.get_memory_bytes(),
+                    "requests": session.requests}
+
+        memory_bytes = sum(session.get_memory_bytes() for session in self.sessions.values())
+        return {
+            "sessions": len(self.sessions),
+            "memory_bytes": memory_bytes,
+            "memory_bytes_per_session": memory_bytes / len(self.sessions) if self.sessions else 0,
+            "requests": self.requests,
+            "ai_moves": self.ai_moves,
+            "ai_move_ms": self.ai_move_ms / self.ai_moves if self.ai_moves else 0.0,
+        }
+
+    # endregion Private methods
+
+
+async def _main(args: argparse.Namespace) -> None:
+    server = GameServer(args.workers, args.ai_depth, args.ai_time_ms)
+    await server.start(args.host, args.port)
+    print(f"Listening on {args.host}:{server.port}")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Hosts checkers games over TCP, one JSON object per line")
+    parser.add_argument("--host", default=GameServer.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=GameServer.DEFAULT_PORT)
+    parser.add_argument("--workers", type=int, default=None, help="processes searching AI moves")
+    parser.add_argument("--ai-depth", type=int, default=None)
+    parser.add_argument("--ai-time-ms", type=float, default=Game.AI_TIME_LIMIT_MS)
+    asyncio.run(_main(parser.parse_args()))
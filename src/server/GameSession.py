@@ -0,0 +1,74 @@
+﻿from __future__ import annotations
+
+import asyncio
+import sys
+import time
+from enum import Enum
+
+from src.model import Game
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses import Position, Side
+
+
+def get_deep_size(obj, seen: set[int]) -> int:
+    """
+    :param seen: ids of objects already counted, shared objects are counted only once over all calls
+    :return: bytes of the object and everything it references, classes and enum members are not counted
+    """
+    if id(obj) in seen or isinstance(obj, (type, Enum)):
+        return 0
+    seen.add(id(obj))
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(get_deep_size(key, seen) + get_deep_size(value, seen) for key, value in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(get_deep_size(item, seen) for item in obj)
+    else:
+        if hasattr(obj, "__dict__"):
+            size += get_deep_size(vars(obj), seen)
+        for slot in getattr(type(obj), "__slots__", ()):
+            if hasattr(obj, slot):
+                size += get_deep_size(getattr(obj, slot), seen)
+    return size
+
+
+def _to_list(position: Position) -> list[int]:
+    return [position.row, position.column]
+
+
+class GameSession:
+    """
+    One game hosted by GameServer. The lock keeps requests of the same session from interleaving
+    while an AI move is computed.
+    """
+
+    def __init__(self, session_id: int, ai_side: Side | None = None):
+        self.session_id = session_id
+        self.game = Game()
+        # AI moves are searched in the server's worker processes, a table per session would cost too much memory
+        self.game.engine = None
+        self.game.ai_side = ai_side
+        self.lock = asyncio.Lock()
+        self.created_at = time.monotonic()
+        self.requests = 0
+
+    def get_memory_bytes(self) -> int:
+        """
+        :return: approximate bytes held by the session's game, without the shared Position instances
+        """
+        seen = {id(Position.at(row, column)) for row in range(BOARD_SIZE) for column in range(BOARD_SIZE)}
+        return get_deep_size(self.game, seen)
+
+    def get_state(self) -> dict:
+        winner = self.game.get_winner()
+        return {
+            "session": self.session_id,
+            "side_to_move": self.game.side_to_move.name,
+            "ai_side": self.game.ai_side.name if self.game.ai_side is not None else None,
+            "winner": winner.name if winner is not None else None,
+            "pieces": [str(piece) for side in (Side.BLACK, Side.WHITE) for piece in self.game.board.get_pieces(side)],
+            "moves": [[*_to_list(move.from_piece.position), *_to_list(move.to_position)]
+                      for move in self.game.get_all_valid_moves(self.game.side_to_move)],
+            "history_length": self.game.history_length,
+        }
@@ -0,0 +1,117 @@
+﻿from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import time
+
+from src.server import GameServer
+
+
+class LoadTestClient:
+    """
+    One connection to a GameServer, requests are sent one at a time
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 1
+        self.latencies_ms: list[float] = []
+
+    @staticmethod
+    async def connect(host: str, port: int) -> LoadTestClient:
+        return LoadTestClient(*await asyncio.open_connection(host, port))
+
+    async def request(self, command: str, **params) -> dict:
+        start_time = time.perf_counter()
+        self._writer.write(json.dumps({"id": self._next_id, "command": command, **params}).encode() + b"\n")
+        self._next_id += 1
+        await self._writer.drain()
+        response = json.loads(await self._reader.readline())
+        self.latencies_ms.append((time.perf_counter() - start_time) * 1000)
+
+        if not response["ok"]:
+            raise RuntimeError(f"{command} failed: {response['error']}")
+        return response
+
+    async def close(self) -> None:
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+async def _play_sessions(client: LoadTestClient, sessions: list[int], plies: int, ai_every: int,
+                         rng: random.Random) -> int:
+    """
+    Plays random moves in the sessions round by round, every ai_every-th move is an AI move
+    :return: number of moves made
+    """
+    moves = 0
+    for ply in range(plies):
+        for session in sessions:
+            state = await client.request("state", session=session)
+            if state["winner"] is not None:
+                continue
+
+            if ai_every and ply % ai_every == ai_every - 1:
+                await client.request("ai_move", session=session)
+            else:
+                from_row, from_column, to_row, to_column = rng.choice(state["moves"])
+                await client.request("select", session=session, position=[from_row, from_column])
+                await client.request("move", session=session, **{"from": [from_row, from_column],
+                                                                 "to": [to_row, to_column]})
+            moves += 1
+    return moves
+
+
+async def run_load_test(host: str, port: int, sessions: int, connections: int, plies: int, ai_every: int,
+                        seed: int = 0) -> dict:
+    """
+    Opens all sessions first so they are in the server's memory at the same time, then plays them
+    :return: request counts, throughput, latency percentiles and the server's stats
+    """
+    clients = [await LoadTestClient.connect(host, port) for _ in range(connections)]
+    start_time = time.perf_counter()
+
+    client_sessions: list[list[int]] = [[] for _ in clients]
+    for index in range(sessions):
+        response = await clients[index % connections].request("new")
+        client_sessions[index % connections].append(response["session"])
+
+    moves = sum(await asyncio.gather(*(_play_sessions(client, own_sessions, plies, ai_every, random.Random(seed + index))
+                                       for index, (client, own_sessions) in enumerate(zip(clients, client_sessions)))))
+    server_stats = await clients[0].request("stats")
+
+    for client, own_sessions in zip(clients, client_sessions):
+        for session in own_sessions:
+            await client.request("close", session=session)
+
+    elapsed = time.perf_counter() - start_time
+    latencies = sorted(latency for client in clients for latency in client.latencies_ms)
+    for client in clients:
+        await client.close()
+
+    return {
+        "requests": len(latencies),
+        "moves": moves,
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "latency_ms_p50": latencies[len(latencies) // 2],
+        "latency_ms_p99": latencies[min(len(latencies) - 1, len(latencies) * 99 // 100)],
+        "server": server_stats,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Drives many sessions of a running GameServer")
+    parser.add_argument("--host", default=GameServer.DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=GameServer.DEFAULT_PORT)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--connections", type=int, default=50)
+    parser.add_argument("--plies", type=int, default=20, help="moves played in every session")
+    parser.add_argument("--ai-every", type=int, default=0, help="every n-th move is an AI move, 0 for none")
+    args = parser.parse_args()
+    result = asyncio.run(run_load_test(args.host, args.port, args.sessions, args.connections, args.plies,
+                                       args.ai_every))
+    print(json.dumps(result, indent=2))
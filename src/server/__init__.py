@@ -0,0 +1,2 @@
+﻿from .GameSession import GameSession
+from .GameServer import GameServer
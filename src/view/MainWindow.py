@@ -5,13 +5,14 @@ from tkinter import messagebox, filedialog
 
 from src.model import Board
 from src.model.constants import BOARD_SIZE
-from src.model.dataclasses import Position, Side, Piece, Coords
+from src.model.dataclasses import Position, Side, Coords
+from src.view.PieceSprite import PieceSprite, get_field_coords, get_piece_sprites, get_sprite_changes
 
 
 class MainWindow(tk.Tk):
-    WINDOW_SIZE = 500
-    FIELD_SIZE = WINDOW_SIZE / BOARD_SIZE
-    PIECE_SIZE = FIELD_SIZE * 0.8
+    WINDOW_SIZE = PieceSprite.WINDOW_SIZE
+    FIELD_SIZE = PieceSprite.FIELD_SIZE
+    PIECE_SIZE = PieceSprite.PIECE_SIZE
 
     ICON_FILE = "icon.ico"
 
@@ -19,8 +20,10 @@ class MainWindow(tk.Tk):
     DARK_FIELD_COLOR = "#a34911"
     BACKGROUND_COLOR = "#bcbcbc"
 
-    LIGHT_PIECE_COLOR = "#ffffff"
-    DARK_PIECE_COLOR = "#000000"
+    LIGHT_PIECE_COLOR = PieceSprite.LIGHT_PIECE_COLOR
+    DARK_PIECE_COLOR = PieceSprite.DARK_PIECE_COLOR
+
+    AI_PROGRESS_COLOR = "#3b6fd8"
 
     def __init__(self):
         super().__init__()
@@ -28,7 +31,10 @@ class MainWindow(tk.Tk):
 
         # Canvas objects
         self._highlights_graphics: list[int] = []
-        self._pieces_graphics: list[int] = []
+        # Oval and crown (None for men) of every drawn piece
+        self._pieces_graphics: dict[Position, tuple[int, int | None]] = {}
+        self._drawn_sprites: dict[Position, PieceSprite] = {}
+        self._ai_progress_graphics: list[int] = []
 
     def setup(self, controller) -> None:
         # Root
@@ -60,11 +66,13 @@ class MainWindow(tk.Tk):
 
     def draw_board(self) -> None:
         self._canvas.delete("all")
+        self._pieces_graphics.clear()
+        self._drawn_sprites.clear()
 
         for row in range(BOARD_SIZE):
             for col in range(BOARD_SIZE):
-                color = self._get_field_color(Position(row, col))
-                canvas_coords = self._get_field_coords(Position(row, col))
+                color = self._get_field_color(Position.at(row, col))
+                canvas_coords = self._get_field_coords(Position.at(row, col))
 
                 self._canvas.create_rectangle(canvas_coords.x, canvas_coords.y,
                                               canvas_coords.x + self.FIELD_SIZE,
@@ -74,14 +82,24 @@ class MainWindow(tk.Tk):
         self._canvas.update()
 
     def draw_pieces(self, board: Board) -> None:
-        self._clear_pieces_graphics()
+        """
+        Redraws only the fields that changed since the last call, a move touches a few canvas items
+        """
+        sprites = {sprite.position: sprite for sprite in get_piece_sprites(board)}
+        removed, added = get_sprite_changes(self._drawn_sprites, sprites)
 
-        for row in range(BOARD_SIZE):
-            for col in range(BOARD_SIZE):
-                piece = board.get_piece(Position(row, col))
-                self._draw_piece(piece, Position(row, col))
+        # Items of the removed pieces are moved and recoloured for the added ones instead of being recreated
+        free_items = [self._pieces_graphics.pop(position) for position in removed]
+        for sprite in added:
+            self._pieces_graphics[sprite.position] = self._draw_piece(sprite, free_items.pop() if free_items else None)
 
-        self._canvas.update()
+        for oval, crown in free_items:
+            self._canvas.delete(oval)
+            if crown is not None:
+                self._canvas.delete(crown)
+
+        self._drawn_sprites = sprites
+        self._canvas.update_idletasks()
 
     def highlight_fields(self, positions: list[Position]) -> None:
         for position in positions:
@@ -103,6 +121,28 @@ class MainWindow(tk.Tk):
                                         fill="", outline="red", width=2)
         self._highlights_graphics.append(oval)
 
+    def show_ai_progress(self, from_position: Position, to_position: Position, depth: int) -> None:
+        """
+        Marks the best AI move found so far
+        """
+        self.clear_ai_progress()
+        self.title(f"Checkers - AI thinking (depth {depth})")
+
+        for position in (from_position, to_position):
+            canvas_coords = self._get_field_coords(position)
+            rectangle = self._canvas.create_rectangle(canvas_coords.x, canvas_coords.y,
+                                                      canvas_coords.x + self.FIELD_SIZE,
+                                                      canvas_coords.y + self.FIELD_SIZE,
+                                                      fill="", outline=self.AI_PROGRESS_COLOR, width=3, dash=(4, 2))
+            self._ai_progress_graphics.append(rectangle)
+
+    def clear_ai_progress(self) -> None:
+        self.title("Checkers")
+        for graphic in self._ai_progress_graphics:
+            self._canvas.delete(graphic)
+
+        self._ai_progress_graphics.clear()
+
     def show_winner(self, winner_side: Side, seconds: int) -> None:
         self.unbind("<Button-1>")
         messagebox.showinfo("Game finished", f"{winner_side.name} won in {seconds} seconds!")
@@ -133,47 +173,41 @@ class MainWindow(tk.Tk):
 
     # region Private methods
 
-    def _clear_pieces_graphics(self) -> None:
-        for piece in self._pieces_graphics:
-            self._canvas.delete(piece)
-
-        self._pieces_graphics.clear()
-
-    def _draw_piece(self, piece: Piece, coords: Position) -> None:
-        if piece is None:
-            return
-
+    def _draw_piece(self, sprite: PieceSprite, items: tuple[int, int | None] | None = None) -> tuple[int, int | None]:
+        """
+        :param items: oval and crown to reuse, new ones are created if None
+        :return: oval and crown (None for men) of the piece
+        """
         # Draw circle
-        color = self._get_piece_color(piece)
-        canvas_coords = self._get_field_coords(coords)
-        offset = (self.FIELD_SIZE - self.PIECE_SIZE) / 2
-
-        oval = self._canvas.create_oval(canvas_coords.x + offset, canvas_coords.y + offset,
-                                        canvas_coords.x + self.PIECE_SIZE + offset,
-                                        canvas_coords.y + self.PIECE_SIZE + offset,
-                                        fill=color, outline="")
-        self._pieces_graphics.append(oval)
+        if items is None:
+            oval = self._canvas.create_oval(*sprite.bounds, fill=sprite.color, outline="")
+            crown = None
+        else:
+            oval, crown = items
+            self._canvas.coords(oval, *sprite.bounds)
+            self._canvas.itemconfig(oval, fill=sprite.color)
 
         # Draw crown
-        if not piece.is_king:
-            return
-
-        font_size = int(30 * (self.WINDOW_SIZE / 500))
-        crown = self._canvas.create_text(canvas_coords.x + self.FIELD_SIZE / 2,
-                                         canvas_coords.y + self.FIELD_SIZE / 2,
-                                         text="♔",
-                                         fill=self.DARK_PIECE_COLOR if piece.side == Side.WHITE else self.LIGHT_PIECE_COLOR,
-                                         font=f"helvetica {font_size}")
-        self._pieces_graphics.append(crown)
-
-    def _get_field_coords(self, position: Position) -> Coords:
-        return Coords(position.column * self.FIELD_SIZE, position.row * self.FIELD_SIZE)
-
-    def _get_piece_color(self, piece: Piece) -> str | None:
-        if piece is None:
-            return None
+        if sprite.crown_color is None:
+            if crown is not None:
+                self._canvas.delete(crown)
+            return oval, None
+
+        x0, y0, x1, y1 = sprite.bounds
+        if crown is None:
+            font_size = int(30 * (self.WINDOW_SIZE / 500))
+            crown = self._canvas.create_text((x0 + x1) / 2, (y0 + y1) / 2,
+                                             text="♔",
+                                             fill=sprite.crown_color,
+                                             font=f"helvetica {font_size}")
+        else:
+            self._canvas.coords(crown, (x0 + x1) / 2, (y0 + y1) / 2)
+            self._canvas.itemconfig(crown, fill=sprite.crown_color)
+        return oval, crown
 
-        return self.LIGHT_PIECE_COLOR if piece.side == Side.WHITE else self.DARK_PIECE_COLOR
+    @staticmethod
+    def _get_field_coords(position: Position) -> Coords:
+        return get_field_coords(position)
 
     def _get_field_color(self, position: Position) -> str:
         if (position.row + position.column) % 2 == 0:
@@ -182,6 +216,6 @@ class MainWindow(tk.Tk):
             return self.DARK_FIELD_COLOR
 
     def _get_field_position(self, coords: Coords) -> Position:
-        return Position(int(coords.y // self.FIELD_SIZE), int(coords.x // self.FIELD_SIZE))
+        return Position.at(int(coords.y // self.FIELD_SIZE), int(coords.x // self.FIELD_SIZE))
 
     # endregion Private methods
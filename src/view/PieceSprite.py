@@ -0,0 +1,61 @@
+﻿from __future__ import annotations
+
+from dataclasses import dataclass
+
+from src.model import Board
+from src.model.constants import BOARD_SIZE
+from src.model.dataclasses import Coords, Position, Side
+
+
+@dataclass(frozen=True)
+class PieceSprite:
+    """
+    Everything MainWindow needs to draw one piece, computed without a window
+    """
+    WINDOW_SIZE = 500
+    FIELD_SIZE = WINDOW_SIZE / BOARD_SIZE
+    PIECE_SIZE = FIELD_SIZE * 0.8
+
+    LIGHT_PIECE_COLOR = "#ffffff"
+    DARK_PIECE_COLOR = "#000000"
+
+    position: Position
+    # Canvas coordinates of the oval: x0, y0, x1, y1
+    bounds: tuple[float, float, float, float]
+    color: str
+    # None for men
+    crown_color: str | None = None
+
+
+def get_field_coords(position: Position) -> Coords:
+    return Coords(position.column * PieceSprite.FIELD_SIZE, position.row * PieceSprite.FIELD_SIZE)
+
+
+def get_piece_sprites(board: Board) -> list[PieceSprite]:
+    """
+    :return: how to draw every piece on the board
+    """
+    offset = (PieceSprite.FIELD_SIZE - PieceSprite.PIECE_SIZE) / 2
+    result: list[PieceSprite] = []
+
+    for side in (Side.BLACK, Side.WHITE):
+        color = PieceSprite.LIGHT_PIECE_COLOR if side == Side.WHITE else PieceSprite.DARK_PIECE_COLOR
+        king_crown_color = PieceSprite.DARK_PIECE_COLOR if side == Side.WHITE else PieceSprite.LIGHT_PIECE_COLOR
+        for piece in board.get_pieces(side):
+            canvas_coords = get_field_coords(piece.position)
+            bounds = (canvas_coords.x + offset, canvas_coords.y + offset,
+                      canvas_coords.x + PieceSprite.PIECE_SIZE + offset,
+                      canvas_coords.y + PieceSprite.PIECE_SIZE + offset)
+            result.append(PieceSprite(piece.position, bounds, color, king_crown_color if piece.is_king else None))
+
+    return result
+
+
+def get_sprite_changes(drawn: dict[Position, PieceSprite], sprites: dict[Position, PieceSprite]) \
+        -> tuple[list[Position], list[PieceSprite]]:
+    """
+    :return: fields whose drawn piece is gone or different, and the sprites that aren't drawn yet
+    """
+    removed = [position for position, sprite in drawn.items() if sprites.get(position) != sprite]
+    added = [sprite for position, sprite in sprites.items() if drawn.get(position) != sprite]
+    return removed, added
@@ -1,2 +1,15 @@
-﻿from .MainWindow import MainWindow
-from .SideWindow import SideWindow
+﻿from .PieceSprite import PieceSprite
+
+
+def __getattr__(name: str):
+    # The Tk windows are imported on first use, so PieceSprite works on machines without Tk
+    if name == "MainWindow":
+        from .MainWindow import MainWindow as window
+    elif name == "SideWindow":
+        from .SideWindow import SideWindow as window
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    # Importing the submodule bound its name to the module, the class replaces it
+    globals()[name] = window
+    return window
@@ -0,0 +1,43 @@
+import unittest
+
+from src.controller import AiProgress, AiResult, AiWorker
+from src.model import Engine, Game
+from src.model.dataclasses import Side
+
+
+def get_result(worker: AiWorker) -> tuple[list[AiProgress], AiResult]:
+    progress = []
+    while True:
+        message = worker.messages.get(timeout=10)
+        if isinstance(message, AiResult):
+            return progress, message
+        progress.append(message)
+
+
+class AiWorkerTest(unittest.TestCase):
+    def test_result(self):
+        game = Game()
+        game.engine = Engine(max_depth=3)
+        worker = AiWorker(game)
+        worker.start()
+        progress, result = get_result(worker)
+
+        assert [message.depth for message in progress] == [1, 2, 3]
+        assert game.find_move(result.from_position, result.to_position) is not None
+        # The search runs on a snapshot
+        assert game.side_to_move == Side.BLACK and game.history_length == 0
+
+    def test_cancel(self):
+        game = Game()
+        game.engine = Engine(max_depth=None)
+        worker = AiWorker(game)
+        worker.start()
+        worker.cancel()
+
+        assert worker.is_cancelled
+        _, result = get_result(worker)
+        assert game.find_move(result.from_position, result.to_position) is not None
+
+
+if __name__ == '__main__':
+    unittest.main()
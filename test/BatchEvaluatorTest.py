@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from src.model import BitBoard, Engine, Game
+from src.model.BatchEvaluator import BLACK_KING, WHITE_MAN, encode_game, numpy
+from src.model.BitBoard import square_index
+from src.model.dataclasses import EvaluationWeights, Position, Side
+
+
+def random_games(count: int) -> list[Game]:
+    rng = random.Random(0)
+    result: list[Game] = []
+    game = Game()
+    while len(result) < count:
+        moves = game.get_all_valid_moves(game.side_to_move)
+        if not moves or game.history_length > 80:
+            game = Game()
+            continue
+        game.make(rng.choice(moves))
+        result.append(Game.from_position(game.get_position()))
+    return result
+
+
+@unittest.skipUnless(numpy, "numpy is not installed")
+class BatchEvaluatorTest(unittest.TestCase):
+    def test_encode(self):
+        game = Game()
+        game.board.set_king(game.board.get_piece(Position(0, 1)), True)
+        row = encode_game(game)
+        assert row[square_index(Position(0, 1))] == BLACK_KING
+        assert row[square_index(Position(5, 0))] == WHITE_MAN
+
+        from src.model import BatchEvaluator
+        encoded = BatchEvaluator.encode_bit_boards([BitBoard.from_game(game)])
+        assert encoded.shape == (1, 32)
+        assert encoded[0].tolist() == row
+
+    def test_same_scores_as_engine(self):
+        from src.model import BatchEvaluator
+        games = random_games(300)
+        for weights in (EvaluationWeights(), EvaluationWeights(mobility=5)):
+            engine = Engine(weights=weights)
+            evaluator = BatchEvaluator(weights)
+            scores = evaluator.evaluate(BatchEvaluator.encode_games(games)).tolist()
+            for game, score in zip(games, scores):
+                expected = engine.evaluate(game)
+                assert score == (expected if game.side_to_move == Side.BLACK else -expected)
+
+            white_scores = evaluator.evaluate(BatchEvaluator.encode_games(games), Side.WHITE).tolist()
+            assert white_scores == [-score for score in scores]
+
+    def test_engine_frontier(self):
+        from src.model import BatchEvaluator
+        for game in random_games(40)[::4]:
+            position = game.get_position()
+            expected = Engine(max_depth=3).search(Game.from_position(position))
+            result = Engine(max_depth=3, batch_evaluator=BatchEvaluator()).search(Game.from_position(position))
+            assert result.score == expected.score
+            assert result.move == expected.move
+
+
+if __name__ == '__main__':
+    unittest.main()
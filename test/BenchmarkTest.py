@@ -0,0 +1,35 @@
+import os
+import tempfile
+import unittest
+
+from benchmark.Benchmark import append_history, compare, load_json, run_case
+from benchmark.Cases import CASES
+
+
+class BenchmarkTest(unittest.TestCase):
+    def test_cases_run(self):
+        for name, setup in CASES.items():
+            setup()()
+
+    def test_run_case(self):
+        assert run_case("Board.get_pieces", repeat=1, min_time_s=0.01) > 0
+
+    def test_compare(self):
+        baseline = {"a": 100.0, "b": 100.0, "c": 100.0}
+        results = {"a": 105.0, "b": 130.0, "c": 50.0, "d": 1000.0}
+        regressions = compare(results, baseline, 0.1)
+        assert list(regressions) == ["b"]
+        assert round(regressions["b"], 2) == 0.3
+        assert compare(results, baseline, 0.5) == {}
+
+    def test_history(self):
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "history.json")
+            append_history({"a": 1.0}, file_path)
+            append_history({"a": 2.0}, file_path)
+            history = load_json(file_path, [])
+        assert [run["results"]["a"] for run in history] == [1.0, 2.0]
+
+
+if __name__ == '__main__':
+    unittest.main()
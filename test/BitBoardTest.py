@@ -0,0 +1,71 @@
+import random
+import unittest
+
+from src.model import BitBoard, BitMove, Game
+from src.model.BitBoard import square_index, square_position
+from src.model.dataclasses import Position, Side
+
+
+def move_key(move) -> tuple[int, int, int]:
+    captured = 0
+    for piece in move.jumped_pieces:
+        captured |= 1 << square_index(piece.position)
+    return square_index(move.from_piece.position), square_index(move.to_position), captured
+
+
+class BitBoardTest(unittest.TestCase):
+    def test_square_index(self):
+        for square in range(32):
+            assert square_index(square_position(square)) == square
+        assert square_position(0) == Position(0, 1)
+        assert square_position(4) == Position(1, 0)
+
+    def test_from_board(self):
+        bit_board = BitBoard.from_game(Game())
+        assert bit_board.black == 0x00000fff
+        assert bit_board.white == 0xfff00000
+        assert bit_board.kings == 0
+        assert bit_board.to_board()._board == Game().board._board
+
+    def test_initial_moves(self):
+        game = Game()
+        bit_board = BitBoard.from_game(game)
+        for side in (Side.BLACK, Side.WHITE):
+            moves = bit_board.get_all_valid_moves(side)
+            assert len(moves) == 7
+            assert sorted(moves) == sorted(move_key(move) for move in game.get_all_valid_moves(side))
+
+    def test_jump_chain(self):
+        game = Game()
+        game.board.delete_piece(game.board.get_piece(Position(6, 1)))
+        game.board.update_piece_position(game.board.get_piece(Position(5, 0)), Position(3, 2))
+        bit_board = BitBoard.from_game(game)
+        moves = bit_board.get_all_valid_moves(Side.BLACK)
+        from_square, to_square = square_index(Position(2, 1)), square_index(Position(6, 1))
+        captured = (1 << square_index(Position(3, 2))) | (1 << square_index(Position(5, 2)))
+        assert BitMove(from_square, to_square, captured) in moves
+
+    def test_apply_move_promotes(self):
+        bit_board = BitBoard(black=1 << square_index(Position(6, 1)), white=1 << square_index(Position(0, 1)))
+        moved = bit_board.apply_move(BitMove(square_index(Position(6, 1)), square_index(Position(7, 0))))
+        assert moved.kings == 1 << square_index(Position(7, 0))
+        assert moved.side_to_move == Side.WHITE
+
+    def test_same_moves_as_game(self):
+        rng = random.Random(0)
+        bit_board = BitBoard.from_game(Game())
+        for _ in range(100):
+            game = Game()
+            game.board = bit_board.to_board()
+            for side in (Side.BLACK, Side.WHITE):
+                expected = sorted(move_key(move) for move in game.get_all_valid_moves(side))
+                assert sorted(bit_board.get_all_valid_moves(side)) == expected
+
+            moves = bit_board.get_all_valid_moves(bit_board.side_to_move)
+            if not moves:
+                break
+            bit_board = bit_board.apply_move(rng.choice(moves))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
+import random
 import unittest
 
-from src.model import Board
+from src.model import Board, Game, MoveTables
 from src.model.dataclasses import Position, Side
 
 
@@ -33,6 +34,58 @@ class BoardTest(unittest.TestCase):
         assert len(board.get_pieces(Side.WHITE)) == 12
         assert len(board.get_pieces(Side.BLACK)) == 12
 
+    def test_get_pieces_after_moves(self):
+        board = Board()
+        board.set_initial_positions()
+        board.delete_piece(board.get_piece(Position(5, 0)))
+        board.update_piece_position(board.get_piece(Position(2, 1)), Position(3, 0))
+        assert len(board.get_pieces(Side.WHITE)) == 11
+        assert board.count_pieces(Side.WHITE) == 11
+        assert board.count_pieces(Side.BLACK) == 12
+        assert Position(3, 0) in [piece.position for piece in board.get_pieces(Side.BLACK)]
+        assert Position(2, 1) not in [piece.position for piece in board.get_pieces(Side.BLACK)]
+
+    def test_count_kings(self):
+        board = Board()
+        board.set_initial_positions()
+        piece = board.get_piece(Position(0, 1))
+        board.set_king(piece, True)
+        assert board.count_kings(Side.BLACK) == 1
+        assert board.count_kings(Side.WHITE) == 0
+        board.update_piece_position(piece, Position(3, 0))
+        assert board.count_kings(Side.BLACK) == 1
+        board.delete_piece(piece)
+        assert board.count_kings(Side.BLACK) == 0
+        assert board.count_pieces(Side.BLACK) == 11
+
+    def test_get_attackers(self):
+        board = Board()
+        board.set_initial_positions()
+        assert not board.get_attackers(Position(2, 1))
+        board.update_piece_position(board.get_piece(Position(5, 0)), Position(3, 2))
+        attackers = board.get_attackers(Position(3, 2))
+        assert {piece.position for piece in attackers} == {Position(2, 1), Position(2, 3)}
+        assert not board.is_attacked(Position(2, 1))
+        board.delete_piece(board.get_piece(Position(2, 3)))
+        assert [piece.position for piece in board.get_attackers(Position(3, 2))] == [Position(2, 1)]
+
+    def test_attackers_follow_moves(self):
+        rng = random.Random(0)
+        game = Game()
+        for _ in range(80):
+            for piece in game.board.get_pieces(Side.BLACK) + game.board.get_pieces(Side.WHITE):
+                expected = set()
+                for enemy in game.board.get_pieces(piece.side.get_enemy()):
+                    for jumped_position, landing_position in MoveTables.get_jumps(enemy):
+                        if jumped_position == piece.position and game.board.get_piece(landing_position) is None:
+                            expected.add(enemy.position)
+                assert {attacker.position for attacker in game.board.get_attackers(piece.position)} == expected
+
+            moves = game.get_all_valid_moves(game.side_to_move)
+            if not moves:
+                break
+            game.make(rng.choice(moves))
+
     def test_get_piece_between(self):
         board = Board()
         board.set_initial_positions()
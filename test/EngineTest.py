@@ -0,0 +1,132 @@
+import json
+import threading
+import unittest
+
+from src.model import Board, Engine, Game
+from src.model.dataclasses import Piece, Position, Side
+
+
+def snapshot(game: Game):
+    return {position: (piece.side, piece.is_king) for position, piece in game.board._board.items()}, \
+        game.side_to_move, game.zobrist_key
+
+
+class StoppingEngine(Engine):
+    def __init__(self, stop_after_nodes: int):
+        super().__init__(max_depth=None)
+        self.stop_event = threading.Event()
+        self._stop_after_nodes = stop_after_nodes
+        self._armed_at: int | None = None
+
+    def on_progress(self, result) -> None:
+        if result.depth == 2:
+            self._armed_at = self._nodes
+
+    def _negamax(self, game, depth, alpha, beta, ply):
+        if self._armed_at is not None and self._nodes - self._armed_at >= self._stop_after_nodes:
+            self.stop_event.set()
+        return super()._negamax(game, depth, alpha, beta, ply)
+
+
+class EngineTest(unittest.TestCase):
+    def test_finds_double_jump(self):
+        game = Game()
+        game.board.update_piece_position(game.board.get_piece(Position(5, 0)), Position(3, 2))
+        game.board.delete_piece(game.board.get_piece(Position(6, 1)))
+        result = Engine(max_depth=2).search(game)
+        assert result.move.from_piece.position == Position(2, 1)
+        assert result.move.to_position == Position(6, 1)
+        assert result.principal_variation[0] == result.move
+
+    def test_finds_win(self):
+        game = Game()
+        game.board = Board()
+        game.board.set_piece(Piece(Side.BLACK, Position(2, 1)))
+        game.board.set_piece(Piece(Side.WHITE, Position(3, 2)))
+        game.board.set_piece(Piece(Side.WHITE, Position(7, 0)))
+        result = Engine(max_depth=4).search(game)
+        assert result.move.to_position == Position(4, 3)
+        assert result.score > 0
+
+    def test_search_leaves_game_unchanged(self):
+        game = Game()
+        before = snapshot(game)
+        Engine(max_depth=4).search(game)
+        assert snapshot(game) == before
+
+    def test_time_limit(self):
+        game = Game()
+        before = snapshot(game)
+        result = Engine(max_depth=None, time_limit_ms=50).search(game)
+        assert result.move in game.get_all_valid_moves(Side.BLACK)
+        assert result.elapsed_ms < 1000
+        assert snapshot(game) == before
+
+    def test_no_moves(self):
+        game = Game()
+        game.board = Board()
+        game.board.set_piece(Piece(Side.BLACK, Position(7, 0)))
+        result = Engine(max_depth=2).search(game)
+        assert result.move is None
+
+    def test_make_best_move_with_heuristic(self):
+        game = Game()
+        game.engine = None
+        game.make_best_move()
+        assert game.side_to_move == Side.WHITE
+
+    def test_stats(self):
+        game = Game()
+        assert Engine(max_depth=3).search(game).stats is None
+
+        result = Engine(max_depth=3, collect_stats=True).search(game)
+        stats = result.stats
+        assert stats.nodes == result.nodes and stats.depth == 3
+        assert 0 < stats.table_probes and stats.table_hits <= stats.table_probes
+        assert stats.first_move_cutoffs <= stats.cutoffs
+        assert 0 < stats.move_generation_ms + stats.evaluation_ms < stats.elapsed_ms
+        assert stats.principal_variation == result.principal_variation
+
+        line = json.loads(stats.to_log_line())
+        assert line["nodes"] == result.nodes
+        assert len(line["principal_variation"]) == len(result.principal_variation)
+        assert all(len(move) == 5 and move[2] == "-" for move in line["principal_variation"])
+
+    def test_stop_event(self):
+        game = Game()
+        stop_event = threading.Event()
+        stop_event.set()
+        result = Engine(max_depth=None).search(game, stop_event=stop_event)
+        assert result.move in game.get_all_valid_moves(Side.BLACK)
+
+    def test_on_progress(self):
+        results = []
+        result = Engine(max_depth=3).search(Game(), on_progress=results.append)
+        assert [progress.depth for progress in results] == [1, 2, 3]
+        assert results[-1].move == result.move
+
+    def test_window(self):
+        score = Engine(max_depth=3).search(Game()).score
+        assert Engine(max_depth=3).search(Game(), window=(score - 1, score + 1)).score == score
+        assert Engine(max_depth=3).search(Game(), window=(score, score + 1)).score <= score
+        assert Engine(max_depth=3).search(Game(), window=(score - 2, score - 1)).score >= score - 1
+
+    def test_interrupted_iteration_line(self):
+        # The best move changes in the middle of depth 3, the search is stopped 100 nodes into it
+        game = Game.from_position((51711, 4291952640, 0, 1))
+        engine = StoppingEngine(100)
+        result = engine.search(game, stop_event=engine.stop_event, on_progress=engine.on_progress)
+        assert result.depth == 2
+        assert result.principal_variation[0] == result.move
+        assert len(result.principal_variation) == 3
+
+    def test_make_best_move_returns_stats(self):
+        game = Game()
+        game.engine = Engine(max_depth=2, collect_stats=True)
+        stats = game.make_best_move()
+        assert stats.source == "engine" and stats.depth == 2
+        assert game.history_length == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
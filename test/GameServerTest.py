@@ -0,0 +1,114 @@
+import asyncio
+import json
+import unittest
+
+from src.server import GameServer, GameSession
+from src.server.LoadTest import run_load_test
+
+
+class GameServerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.server = GameServer(workers=1, ai_max_depth=1)
+
+    async def asyncTearDown(self):
+        await self.server.close()
+
+    async def test_new_and_state(self):
+        response = await self.server.handle_request({"id": 7, "command": "new", "ai_side": "WHITE"})
+        assert response["ok"] and response["id"] == 7
+        assert response["ai_side"] == "WHITE"
+        assert len(response["pieces"]) == 24
+        assert len(response["moves"]) == 7
+
+        state = await self.server.handle_request({"command": "state", "session": response["session"]})
+        assert state["side_to_move"] == "BLACK"
+
+    async def test_select_and_move(self):
+        session = (await self.server.handle_request({"command": "new"}))["session"]
+        response = await self.server.handle_request({"command": "select", "session": session, "position": [2, 1]})
+        assert sorted(response["moves"]) == [[3, 0], [3, 2]]
+
+        response = await self.server.handle_request({"command": "move", "session": session,
+                                                     "from": [2, 1], "to": [3, 2]})
+        assert response["ok"]
+        assert response["side_to_move"] == "WHITE"
+        assert "b32" in response["pieces"]
+
+    async def test_errors(self):
+        response = await self.server.handle_request({"command": "state", "session": 99})
+        assert not response["ok"]
+        response = await self.server.handle_request({"command": "jump"})
+        assert not response["ok"]
+
+        session = (await self.server.handle_request({"command": "new"}))["session"]
+        response = await self.server.handle_request({"command": "move", "session": session,
+                                                     "from": [2, 1], "to": [4, 3]})
+        assert response == {"ok": False, "error": "Invalid move"}
+
+    async def test_malformed_fields(self):
+        session = (await self.server.handle_request({"command": "new"}))["session"]
+        for request in ({"command": ["x"]}, {"command": "state", "session": [1]},
+                        {"command": "stats", "session": {"a": 1}}, {"command": "new", "ai_side": ["WHITE"]},
+                        {"command": "select", "session": session, "position": [float("inf"), 0]},
+                        {"command": "state", "session": True}):
+            response = await self.server.handle_request(request)
+            assert not response["ok"] and "error" in response
+
+    async def test_ai_move(self):
+        session = (await self.server.handle_request({"command": "new"}))["session"]
+        response = await self.server.handle_request({"command": "ai_move", "session": session})
+        assert response["ok"]
+        assert response["history_length"] == 1
+        assert self.server.ai_moves == 1
+
+    async def test_close_and_stats(self):
+        session = (await self.server.handle_request({"command": "new"}))["session"]
+        stats = await self.server.handle_request({"command": "stats", "session": session})
+        assert stats["memory_bytes"] > 0
+
+        stats = await self.server.handle_request({"command": "stats"})
+        assert stats["sessions"] == 1
+
+        responses = await asyncio.gather(*(self.server.handle_request({"command": "close", "session": session})
+                                           for _ in range(2)))
+        assert responses[0]["ok"]
+        assert not self.server.sessions
+
+    async def test_tcp(self):
+        await self.server.start(port=0)
+        reader, writer = await asyncio.open_connection(GameServer.DEFAULT_HOST, self.server.port)
+        writer.write(b'{"command": "new"}\nnot json\n')
+        assert json.loads(await reader.readline())["ok"]
+        assert json.loads(await reader.readline()) == {"ok": False, "error": "Invalid JSON"}
+        writer.close()
+        await writer.wait_closed()
+
+    async def test_close_with_open_connection(self):
+        await self.server.start(port=0)
+        reader, writer = await asyncio.open_connection(GameServer.DEFAULT_HOST, self.server.port)
+        writer.write(b'{"command": "new"}\n')
+        assert json.loads(await reader.readline())["ok"]
+
+        await self.server.close()
+        assert await reader.read() == b""
+        writer.close()
+
+    async def test_load_test(self):
+        await self.server.start(port=0)
+        result = await run_load_test(GameServer.DEFAULT_HOST, self.server.port, sessions=6, connections=2, plies=4,
+                                     ai_every=2)
+        assert result["server"]["sessions"] == 6
+        assert result["moves"] > 0
+        assert not self.server.sessions
+
+
+class GameSessionTest(unittest.TestCase):
+    def test_memory_grows_with_history(self):
+        session = GameSession(1)
+        memory_bytes = session.get_memory_bytes()
+        session.game.apply_move(session.game.get_all_valid_moves(session.game.side_to_move)[0])
+        assert session.get_memory_bytes() > memory_bytes
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,7 @@
+import random
 import unittest
 from src.model import Game, Board
-from src.model.dataclasses import Position, Move, Side
+from src.model.dataclasses import Position, Move, Side, Piece
 
 class IsValidMove(unittest.TestCase):
     def test_is_move_valid_from_edge(self):
@@ -90,6 +91,59 @@ class ApplyMove(unittest.TestCase):
         assert game.board.get_piece(enemy_pos) is None
         assert game.side_to_move != before_side
 
+class MakeUnmake(unittest.TestCase):
+    @staticmethod
+    def snapshot(game: Game):
+        return {position: (piece.side, piece.is_king) for position, piece in game.board._board.items()}, \
+            game.side_to_move, game.board.count_kings(Side.BLACK), game.board.count_kings(Side.WHITE)
+
+    def test_make_removes_jumped_pieces(self):
+        game = Game()
+        game.board.update_piece_position(game.board.get_piece(Position(5, 0)), Position(3, 2))
+        move = game.get_valid_moves(game.board.get_piece(Position(2, 1)))[Position(4, 3)]
+        game.make(move)
+        assert game.board.get_piece(Position(3, 2)) is None
+        assert game.board.count_pieces(Side.WHITE) == 11
+        game.unmake()
+        assert game.board.get_piece(Position(3, 2)) is not None
+        assert game.board.get_piece(Position(2, 1)) is not None
+        assert game.side_to_move == Side.BLACK
+
+    def test_make_promotes(self):
+        game = Game()
+        game.board = Board()
+        piece = Piece(Side.BLACK, Position(6, 1))
+        game.board.set_piece(piece)
+        game.make(Move(piece, Position(7, 0), []))
+        assert piece.is_king
+        game.unmake()
+        assert not piece.is_king
+        assert game.board.count_kings(Side.BLACK) == 0
+
+    def test_king_stays_king(self):
+        game = Game()
+        game.board = Board()
+        piece = Piece(Side.WHITE, Position(3, 2), True)
+        game.board.set_piece(piece)
+        game.make(Move(piece, Position(4, 3), []))
+        assert piece.is_king
+
+    def test_unmake_restores_position(self):
+        rng = random.Random(0)
+        game = Game()
+        snapshots = []
+        for _ in range(60):
+            moves = game.get_all_valid_moves(game.side_to_move)
+            if not moves:
+                break
+            snapshots.append(self.snapshot(game))
+            game.make(rng.choice(moves))
+
+        while snapshots:
+            game.unmake()
+            assert self.snapshot(game) == snapshots.pop()
+
+
 class GetBestMove(unittest.TestCase):
     def test_get_best_move(self):
         game = Game()
@@ -108,6 +162,72 @@ class GetWinner(unittest.TestCase):
             game.board.delete_piece(piece)
         assert game.get_winner() == Side.BLACK
 
+    def test_get_winner_blocked(self):
+        game = Game()
+        game.board = Board()
+        game.board.set_piece(Piece(Side.BLACK, Position(6, 1)))
+        game.board.set_piece(Piece(Side.WHITE, Position(7, 0)))
+        game.board.set_piece(Piece(Side.WHITE, Position(7, 2)))
+        assert game.get_winner() == Side.WHITE
+
+    def test_get_winner_none(self):
+        assert Game().get_winner() is None
+
+
+class IterMoves(unittest.TestCase):
+    def test_iter_moves_matches_lists(self):
+        rng = random.Random(1)
+        game = Game()
+        for _ in range(60):
+            moves = game.get_all_valid_moves(game.side_to_move)
+            assert list(game.iter_moves(game.side_to_move)) == moves
+            if not moves:
+                break
+            game.make(rng.choice(moves))
+
+    def test_iter_piece_moves_steps_first(self):
+        game = Game()
+        game.board = Board()
+        piece = Piece(Side.BLACK, Position(2, 1))
+        game.board.set_piece(piece)
+        game.board.set_piece(Piece(Side.WHITE, Position(3, 2)))
+        moves = game.iter_piece_moves(piece)
+        assert next(moves).to_position == Position(3, 0)
+        assert next(moves).jumped_pieces == [game.board.get_piece(Position(3, 2))]
+        assert next(moves, None) is None
+
+    def test_find_move(self):
+        game = Game()
+        move = game.find_move(Position(2, 1), Position(3, 2))
+        assert move.from_piece.position == Position(2, 1) and move.to_position == Position(3, 2)
+        assert game.find_move(Position(2, 1), Position(4, 3)) is None
+        assert game.find_move(Position(5, 0), Position(4, 1)) is None
+
+
+class HasAnyValidMove(unittest.TestCase):
+    def test_has_any_valid_move(self):
+        game = Game()
+        assert game.has_any_valid_move(Side.BLACK)
+        assert game.has_any_valid_move(Side.WHITE)
+
+    def test_only_jump(self):
+        game = Game()
+        game.board = Board()
+        game.board.set_piece(Piece(Side.BLACK, Position(0, 1)))
+        game.board.set_piece(Piece(Side.WHITE, Position(1, 0)))
+        game.board.set_piece(Piece(Side.WHITE, Position(1, 2)))
+        assert [move.to_position for move in game.get_all_valid_moves(Side.BLACK)] == [Position(2, 3)]
+        assert game.has_any_valid_move(Side.BLACK)
+
+    def test_no_move(self):
+        game = Game()
+        game.board = Board()
+        game.board.set_piece(Piece(Side.BLACK, Position(6, 1)))
+        game.board.set_piece(Piece(Side.WHITE, Position(7, 0)))
+        game.board.set_piece(Piece(Side.WHITE, Position(7, 2)))
+        assert not game.has_any_valid_move(Side.BLACK)
+        assert game.has_any_valid_move(Side.WHITE)
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,51 @@
+import unittest
+
+from src.model import Board, Game, MoveOrderer
+from src.model.dataclasses import Move, Piece, Position, Side
+
+
+class MoveOrdererTest(unittest.TestCase):
+    def setUp(self):
+        self.game = Game()
+        self.game.board = Board()
+        self.man = Piece(Side.BLACK, Position(2, 1))
+        self.runner = Piece(Side.BLACK, Position(6, 5))
+        self.game.board.set_piece(self.man)
+        self.game.board.set_piece(self.runner)
+        self.game.board.set_piece(Piece(Side.WHITE, Position(3, 2)))
+        self.game.board.set_piece(Piece(Side.WHITE, Position(0, 7)))
+        self.moves = self.game.get_all_valid_moves(Side.BLACK)
+
+    def get_move(self, piece: Piece, to_position: Position) -> Move:
+        return next(move for move in self.moves if move.from_piece is piece and move.to_position == to_position)
+
+    def test_captures_then_promotions(self):
+        ordered = MoveOrderer().order(self.moves, 0)
+        assert ordered[0] == self.get_move(self.man, Position(4, 3))
+        assert ordered[1].to_position.row == 7 and ordered[2].to_position.row == 7
+
+    def test_hash_move_first(self):
+        hash_move = (Position(2, 1), Position(3, 0))
+        ordered = MoveOrderer().order(self.moves, 0, hash_move)
+        assert ordered[0] == self.get_move(self.man, Position(3, 0))
+
+    def test_killer_move(self):
+        orderer = MoveOrderer()
+        killer = self.get_move(self.man, Position(3, 0))
+        orderer.record_cutoff(killer, 2, 3, 1)
+        assert orderer.order(self.moves, 2)[3] == killer
+        assert orderer.cutoffs == 1 and orderer.first_move_cutoffs == 0
+
+    def test_first_move_cutoff_rate(self):
+        orderer = MoveOrderer()
+        capture = self.get_move(self.man, Position(4, 3))
+        orderer.record_cutoff(capture, 0, 1, 0)
+        orderer.record_cutoff(capture, 0, 1, 0)
+        orderer.record_cutoff(capture, 0, 1, 3)
+        assert abs(orderer.first_move_cutoff_rate - 2 / 3) < 1e-9
+        orderer.new_search()
+        assert orderer.cutoffs == 0
+
+
+if __name__ == '__main__':
+    unittest.main()
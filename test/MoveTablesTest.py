@@ -0,0 +1,26 @@
+import unittest
+
+from src.model import MoveTables
+from src.model.dataclasses import Piece, Position, Side
+
+
+class MoveTablesTest(unittest.TestCase):
+    def test_steps(self):
+        assert MoveTables.get_steps(Piece(Side.BLACK, Position(0, 1))) == (Position(1, 2), Position(1, 0))
+        assert MoveTables.get_steps(Piece(Side.WHITE, Position(7, 0))) == (Position(6, 1),)
+        assert len(MoveTables.get_steps(Piece(Side.WHITE, Position(3, 4), True))) == 4
+
+    def test_jumps(self):
+        assert MoveTables.get_jumps(Piece(Side.BLACK, Position(2, 1))) == ((Position(3, 2), Position(4, 3)),)
+        assert MoveTables.get_jumps(Piece(Side.WHITE, Position(1, 2))) == ()
+        assert len(MoveTables.get_jumps(Piece(Side.BLACK, Position(2, 2), True))) == 4
+
+    def test_tables_cover_board(self):
+        for side in Side:
+            for is_king in (False, True):
+                assert len(MoveTables.STEPS[side][is_king]) == 64
+                assert len(MoveTables.JUMPS[side][is_king]) == 64
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import os
+import random
+import tempfile
+import unittest
+
+from src.model import Game, OpeningBook
+from src.model.dataclasses import Position
+
+
+class OpeningBookTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+        cls.file_path = os.path.join(cls.folder, "book.bin")
+        OpeningBook.build(cls.file_path, games=3, plies=3, depth=1, log=lambda message: None)
+        cls.book = OpeningBook(cls.file_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.book.close()
+        os.remove(cls.file_path)
+        os.rmdir(cls.folder)
+
+    def test_initial_position_in_book(self):
+        game = Game()
+        moves = self.book.get_moves(game)
+        assert moves
+        assert sum(weight for _, weight in moves) == 3
+        valid_moves = game.get_all_valid_moves(game.side_to_move)
+        for move, _ in moves:
+            assert move in valid_moves
+
+    def test_unknown_position(self):
+        game = Game()
+        game.board.delete_piece(game.board.get_piece(Position(0, 1)))
+        assert self.book.get_moves(game) == []
+        assert self.book.choose_move(game) is None
+
+    def test_write_sorted(self):
+        file_path = os.path.join(self.folder, "written.bin")
+        game = Game()
+        entries = {
+            game.zobrist_key: {(Position(2, 1), Position(3, 0)): 5, (Position(2, 3), Position(3, 4)): 1},
+            1: {(Position(2, 1), Position(3, 2)): 2},
+            2 ** 64 - 1: {(Position(2, 1), Position(3, 2)): 2},
+        }
+        OpeningBook.write(file_path, entries)
+        book = OpeningBook(file_path)
+        try:
+            assert book.entry_count == 4
+            moves = {(move.from_piece.position, move.to_position): weight for move, weight in book.get_moves(game)}
+            assert moves == entries[game.zobrist_key]
+        finally:
+            book.close()
+            os.remove(file_path)
+
+    def test_default_file(self):
+        assert os.path.isabs(OpeningBook.DEFAULT_FILE)
+        assert os.path.isdir(os.path.join(os.path.dirname(OpeningBook.DEFAULT_FILE), "src"))
+
+    def test_make_best_move_uses_book(self):
+        game = Game()
+        game.engine = None
+        game.opening_book = self.book
+        book_moves = [move for move, _ in self.book.get_moves(game)]
+        random.seed(0)
+        game.make_best_move()
+        assert game.history_length == 1
+        assert any(game.board.get_piece(move.to_position) is not None for move in book_moves)
+
+
+if __name__ == '__main__':
+    unittest.main()
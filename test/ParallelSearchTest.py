@@ -0,0 +1,63 @@
+import random
+import unittest
+
+from src.model import Board, Engine, Game, ParallelSearch
+from src.model.dataclasses import Piece, Position, Side
+
+
+class ParallelSearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.search = ParallelSearch(workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.search.close()
+
+    def test_same_score_as_serial_search(self):
+        game = Game()
+        result = self.search.search(game, 3)
+        assert result.score == Engine(max_depth=3).search(game).score
+        assert result.move in game.get_all_valid_moves(game.side_to_move)
+        assert result.principal_variation[0] == result.move
+        assert len(result.principal_variation) == 3
+
+    def test_same_score_in_random_positions(self):
+        rng = random.Random(0)
+        game = Game()
+        for _ in range(6):
+            for _ in range(3):
+                game.make(rng.choice(game.get_all_valid_moves(game.side_to_move)))
+            result = self.search.search(game, 4)
+            assert result.score == Engine(max_depth=4).search(game).score
+
+    def test_finds_double_jump(self):
+        game = Game()
+        game.board.update_piece_position(game.board.get_piece(Position(5, 0)), Position(3, 2))
+        game.board.delete_piece(game.board.get_piece(Position(6, 1)))
+        result = self.search.search(game, 2)
+        assert result.move.from_piece.position == Position(2, 1)
+        assert result.move.to_position == Position(6, 1)
+
+    def test_winning_capture_at_depth_one(self):
+        game = Game()
+        game.board = Board()
+        game.board.set_piece(Piece(Side.BLACK, Position(2, 1)))
+        game.board.set_piece(Piece(Side.BLACK, Position(2, 5), True))
+        game.board.set_piece(Piece(Side.WHITE, Position(3, 2)))
+        result = self.search.search(game, 1)
+        serial = Engine(max_depth=1).search(game)
+        assert result.score == serial.score == Engine.WIN_SCORE - 1
+        assert result.move.to_position == Position(4, 3)
+
+    def test_game_position_round_trip(self):
+        game = Game()
+        game.make(game.find_move(Position(2, 1), Position(3, 0)))
+        copy = Game.from_position(game.get_position())
+        assert copy.board._board == game.board._board
+        assert copy.side_to_move == game.side_to_move
+        assert copy.zobrist_key == game.zobrist_key
+
+
+if __name__ == '__main__':
+    unittest.main()
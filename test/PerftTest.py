@@ -0,0 +1,29 @@
+import unittest
+
+from src.model.Perft import BACKENDS, INITIAL_POSITION, REFERENCE_COUNTS, check_position, load_position, run_perft
+
+# Deep enough to cover jump chains and promotions, shallow enough for every test run
+TEST_DEPTH = 4
+
+
+class PerftTest(unittest.TestCase):
+    def test_reference_counts(self):
+        for name in REFERENCE_COUNTS:
+            for backend in BACKENDS:
+                assert check_position(name, TEST_DEPTH, backend, log=lambda message: None), (name, backend)
+
+    def test_game_left_unchanged(self):
+        game = load_position("jumps.txt")
+        position = game.get_position()
+        nodes, seconds = run_perft(game, 3, "game")
+        assert nodes == REFERENCE_COUNTS["jumps.txt"][2]
+        assert seconds > 0
+        assert game.get_position() == position
+        assert game.history_length == 0
+
+    def test_depth_zero(self):
+        assert run_perft(load_position(INITIAL_POSITION), 0, "bitboard")[0] == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
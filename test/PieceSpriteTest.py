@@ -0,0 +1,72 @@
+import os
+import subprocess
+import sys
+import unittest
+
+from src.model import Board, Game
+from src.model.dataclasses import Piece, Position, Side
+from src.view import PieceSprite
+from src.view.PieceSprite import get_piece_sprites, get_sprite_changes
+
+
+def get_sprites(board: Board) -> dict[Position, PieceSprite]:
+    return {sprite.position: sprite for sprite in get_piece_sprites(board)}
+
+
+class PieceSpriteTest(unittest.TestCase):
+    def test_get_piece_sprites(self):
+        sprites = get_piece_sprites(Game().board)
+        assert len(sprites) == 24
+        assert {sprite.color for sprite in sprites} == {PieceSprite.LIGHT_PIECE_COLOR, PieceSprite.DARK_PIECE_COLOR}
+        assert all(sprite.crown_color is None for sprite in sprites)
+
+    def test_king_sprite(self):
+        board = Board()
+        board.set_piece(Piece(Side.WHITE, Position(0, 1), True))
+        sprite, = get_piece_sprites(board)
+        assert sprite.crown_color == PieceSprite.DARK_PIECE_COLOR
+        x0, y0, x1, y1 = sprite.bounds
+        assert (x0 + x1) / 2 == 1.5 * PieceSprite.FIELD_SIZE
+        assert (y0 + y1) / 2 == 0.5 * PieceSprite.FIELD_SIZE
+        assert x1 - x0 == PieceSprite.PIECE_SIZE
+
+    def test_sprite_changes_of_step(self):
+        game = Game()
+        drawn = get_sprites(game.board)
+        move = game.find_move(Position(2, 1), Position(3, 0))
+        game.apply_move(move)
+
+        removed, added = get_sprite_changes(drawn, get_sprites(game.board))
+        assert removed == [Position(2, 1)]
+        assert [sprite.position for sprite in added] == [Position(3, 0)]
+
+    def test_sprite_changes_of_capture_and_promotion(self):
+        board = Board()
+        board.set_piece(Piece(Side.BLACK, Position(5, 2)))
+        board.set_piece(Piece(Side.WHITE, Position(6, 3)))
+        board.set_piece(Piece(Side.WHITE, Position(0, 1)))
+        game = Game()
+        game.board = board
+        drawn = get_sprites(game.board)
+        game.apply_move(game.find_move(Position(5, 2), Position(7, 4)))
+
+        removed, added = get_sprite_changes(drawn, get_sprites(game.board))
+        assert set(removed) == {Position(5, 2), Position(6, 3)}
+        sprite, = added
+        assert sprite.position == Position(7, 4) and sprite.crown_color is not None
+
+    def test_no_sprite_changes(self):
+        sprites = get_sprites(Game().board)
+        assert get_sprite_changes(sprites, get_sprites(Game().board)) == ([], [])
+        removed, added = get_sprite_changes({}, sprites)
+        assert removed == [] and len(added) == 24
+
+    def test_import_without_tk(self):
+        # tkinter blocked, like on a Python built without Tk
+        code = "import sys; sys.modules['tkinter'] = None; import benchmark.Cases, src.view.PieceSprite"
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code], cwd=root, check=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
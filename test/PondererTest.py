@@ -0,0 +1,81 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.controller import Ponderer
+from src.model import Engine, Game, OpeningBook
+from src.model.dataclasses import Side
+
+
+def wait_for_results(ponderer: Ponderer, count: int) -> None:
+    deadline = time.perf_counter() + 10
+    while ponderer.pondered_count < count and time.perf_counter() < deadline:
+        time.sleep(0.01)
+
+
+class PondererTest(unittest.TestCase):
+    def test_replies(self):
+        game = Game()
+        game.engine = Engine(max_depth=2, collect_stats=True)
+        game.make_best_move()
+        human_moves = game.get_all_valid_moves(Side.WHITE)
+
+        ponderer = Ponderer(game)
+        ponderer.start()
+        wait_for_results(ponderer, len(human_moves))
+        ponderer.stop()
+
+        assert ponderer.pondered_count == len(human_moves)
+        for human_move in human_moves:
+            result = ponderer.get_result(human_move.from_piece.position, human_move.to_position)
+            assert result.stats.source == "ponder"
+
+            reply_game = Game.from_position(game.get_position())
+            reply_game.make(reply_game.find_move(human_move.from_piece.position, human_move.to_position))
+            assert reply_game.find_move(result.from_position, result.to_position) is not None
+        # Pondering runs on copies
+        assert game.side_to_move == Side.WHITE and game.history_length == 1
+
+    def test_book_replies_keep_source(self):
+        game = Game()
+        game.engine = Engine(max_depth=1, collect_stats=True)
+        game.make_best_move()
+        book_move, *other_moves = game.get_all_valid_moves(Side.WHITE)
+
+        reply_game = Game.from_position(game.get_position())
+        reply_game.make(reply_game.find_move(book_move.from_piece.position, book_move.to_position))
+        reply = reply_game.get_all_valid_moves(Side.BLACK)[0]
+        with tempfile.TemporaryDirectory() as folder:
+            file_path = os.path.join(folder, "book.bin")
+            OpeningBook.write(file_path, {reply_game.zobrist_key: {(reply.from_piece.position, reply.to_position): 1}})
+            game.opening_book = OpeningBook(file_path)
+
+            ponderer = Ponderer(game)
+            ponderer.start()
+            wait_for_results(ponderer, len(other_moves) + 1)
+            ponderer.stop()
+            game.opening_book.close()
+
+        result = ponderer.get_result(book_move.from_piece.position, book_move.to_position)
+        assert result.stats.source == "book"
+        assert (result.from_position, result.to_position) == (reply.from_piece.position, reply.to_position)
+        for move in other_moves:
+            assert ponderer.get_result(move.from_piece.position, move.to_position).stats.source == "ponder"
+
+    def test_stop_discards_unfinished(self):
+        game = Game()
+        game.engine = Engine(max_depth=None)
+        game.make_best_move()
+
+        ponderer = Ponderer(game)
+        ponderer.start()
+        ponderer.stop()
+
+        assert ponderer.pondered_count == 0
+        move = game.get_all_valid_moves(Side.WHITE)[0]
+        assert ponderer.get_result(move.from_piece.position, move.to_position) is None
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,27 @@
+import dataclasses
+import pickle
+import unittest
+
+from src.model.dataclasses import Position
+
+
+class PositionTest(unittest.TestCase):
+    def test_at_is_shared(self):
+        assert Position.at(3, 4) is Position.at(3, 4)
+        assert Position.at(3, 4) == Position(3, 4)
+        assert hash(Position.at(3, 4)) == hash(Position(3, 4))
+
+    def test_at_outside_board(self):
+        assert Position.at(-1, 8) == Position(-1, 8)
+        assert Position.at(8, 0) is not Position.at(8, 0)
+
+    def test_frozen(self):
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            Position.at(0, 1).row = 2
+
+    def test_pickle_keeps_shared_instance(self):
+        assert pickle.loads(pickle.dumps(Position.at(5, 2))) is Position.at(5, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
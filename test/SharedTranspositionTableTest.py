@@ -0,0 +1,49 @@
+import unittest
+
+from src.model import Engine, Game, ParallelSearch, SharedTranspositionTable
+from src.model.dataclasses import Bound, Position
+
+
+class SharedTranspositionTableTest(unittest.TestCase):
+    def setUp(self):
+        self.table = SharedTranspositionTable.create(64 * 1024)
+        self.other = SharedTranspositionTable.attach(self.table.name, 1)
+
+    def tearDown(self):
+        self.other.close()
+        self.table.close()
+
+    def test_store_and_probe_across_handles(self):
+        move = (Position.at(2, 1), Position.at(3, 0))
+        self.table.store(0xDEADBEEF12345678, 4, -250, Bound.LOWER, move)
+        entry = self.other.probe(0xDEADBEEF12345678)
+        assert entry.depth == 4 and entry.score == -250 and entry.bound == Bound.LOWER and entry.best_move == move
+        assert self.other.cross_worker_hits == 1
+        assert self.table.probe(0xDEADBEEF12345678).best_move == move
+        assert self.table.cross_worker_hits == 0
+
+    def test_no_move_and_win_scores(self):
+        self.other.store(99, 0, -Engine.WIN_SCORE, Bound.EXACT, None)
+        entry = self.table.probe(99)
+        assert entry.best_move is None and entry.score == -Engine.WIN_SCORE
+
+    def test_torn_entry_is_a_miss(self):
+        key = 12345
+        self.table.store(key, 2, 10, Bound.EXACT, None)
+        index = (key & self.table._mask) * SharedTranspositionTable.BUCKET_SIZE * 2
+        # Data word rewritten by another writer, check word not yet
+        self.table._words[index + 1] ^= 1 << 33
+        assert self.other.probe(key) is None
+        assert self.other.collisions == 1
+
+    def test_parallel_search_with_shared_table(self):
+        game = Game()
+        with ParallelSearch(workers=2, shared_table_bytes=1 << 20) as search:
+            result = search.search(game, 4)
+            assert result.score == Engine(max_depth=4).search(game).score
+            assert search.table_stats["hits"] + search.table_stats["misses"] > 0
+            assert 0.0 <= search.cross_worker_hit_rate <= 1.0
+
+
+if __name__ == '__main__':
+    unittest.main()
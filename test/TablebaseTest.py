@@ -0,0 +1,102 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from src.model import Board, Engine, Game, Tablebase
+from src.model.Tablebase import _iter_positions, get_index, get_table_size
+from src.model.dataclasses import Outcome, Piece, Position, Side, TablebaseResult
+
+
+class TablebaseTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.folder = tempfile.mkdtemp()
+        Tablebase.generate(cls.folder, 2, log=lambda message: None)
+        cls.tablebase = Tablebase(cls.folder)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebase.close()
+        shutil.rmtree(cls.folder)
+
+    @staticmethod
+    def create_game(pieces: list[Piece], side_to_move: Side) -> Game:
+        game = Game()
+        game.board = Board()
+        for piece in pieces:
+            game.board.set_piece(piece)
+        game.side_to_move = side_to_move
+        return game
+
+    def test_unique_indexes(self):
+        signature = (1, 0, 0, 1)
+        indexes = {get_index(bit_board, signature) for bit_board in _iter_positions(signature)}
+        assert len(indexes) == 28 * 31 * 2
+        assert max(indexes) < get_table_size(signature)
+
+    def test_consistent_with_children(self):
+        for signature in ((1, 0, 0, 1), (0, 1, 1, 0), (0, 1, 0, 1)):
+            for bit_board in _iter_positions(signature):
+                children = []
+                for move in bit_board.get_all_valid_moves(bit_board.side_to_move):
+                    child = bit_board.apply_move(move)
+                    if not child.get_pieces(child.side_to_move):
+                        children.append(TablebaseResult(Outcome.LOSS, 0))
+                    else:
+                        children.append(self.tablebase.probe_bit_board(child))
+
+                losses = [child.distance for child in children if child.outcome == Outcome.LOSS]
+                if not children:
+                    expected = TablebaseResult(Outcome.LOSS, 0)
+                elif losses:
+                    expected = TablebaseResult(Outcome.WIN, min(losses) + 1)
+                elif all(child.outcome == Outcome.WIN for child in children):
+                    expected = TablebaseResult(Outcome.LOSS, max(child.distance for child in children) + 1)
+                else:
+                    expected = TablebaseResult(Outcome.DRAW, 0)
+                assert self.tablebase.probe_bit_board(bit_board) == expected
+
+    def test_capture_wins(self):
+        pieces = [Piece(Side.BLACK, Position(2, 1)), Piece(Side.WHITE, Position(3, 2))]
+        result = self.tablebase.probe(self.create_game(pieces, Side.BLACK))
+        assert result.outcome == Outcome.WIN and result.distance == 1
+        assert self.tablebase.adjudicate(self.create_game(pieces, Side.WHITE)) == Side.WHITE
+
+    def test_get_winner_adjudicates(self):
+        pieces = [Piece(Side.BLACK, Position(0, 3)), Piece(Side.WHITE, Position(5, 4))]
+        game = self.create_game(pieces, Side.BLACK)
+        assert game.get_winner() is None
+
+        game.tablebase = self.tablebase
+        assert game.get_winner() == Side.BLACK
+        game.tablebase = Tablebase(os.path.join(self.folder, "missing"))
+        assert game.get_winner() is None
+
+    def test_default_folder(self):
+        assert os.path.isabs(Tablebase.DEFAULT_FOLDER)
+        assert os.path.isdir(os.path.join(os.path.dirname(Tablebase.DEFAULT_FOLDER), "src"))
+
+    def test_not_in_tablebase(self):
+        assert self.tablebase.max_pieces == 2
+        assert self.tablebase.probe(Game()) is None
+        assert self.tablebase.adjudicate(Game()) is None
+
+    def test_same_as_search(self):
+        pieces = [Piece(Side.BLACK, Position(0, 3)), Piece(Side.WHITE, Position(5, 4))]
+        game = self.create_game(pieces, Side.BLACK)
+        result = self.tablebase.probe(game)
+        assert result.outcome == Outcome.WIN and result.distance == 5
+        score = Engine(max_depth=result.distance).search(game).score
+        assert score == Engine.WIN_SCORE - result.distance
+
+    def test_engine_uses_tablebase(self):
+        pieces = [Piece(Side.BLACK, Position(0, 3)), Piece(Side.WHITE, Position(5, 4))]
+        game = self.create_game(pieces, Side.BLACK)
+        distance = self.tablebase.probe(game).distance
+        result = Engine(max_depth=2, tablebase=self.tablebase).search(game)
+        assert result.score == Engine.WIN_SCORE - distance
+
+
+if __name__ == '__main__':
+    unittest.main()
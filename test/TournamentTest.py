@@ -0,0 +1,55 @@
+import math
+import random
+import unittest
+
+from src.model import Game
+from src.model.BitBoard import square_position
+from src.model.Tournament import Tournament, get_distinct_openings, get_random_opening, play_game
+from src.model.dataclasses import PlayerConfig, Side, TournamentResult
+
+
+class TournamentTest(unittest.TestCase):
+    def test_random_opening(self):
+        opening = get_random_opening(random.Random(1), 4)
+        assert len(opening) == 4
+        assert opening == get_random_opening(random.Random(1), 4)
+
+    def test_distinct_openings(self):
+        openings = get_distinct_openings(random.Random(0), 40, 4)
+        keys = set()
+        for opening in openings:
+            game = Game()
+            for from_square, to_square in opening:
+                game.make(game.find_move(square_position(from_square), square_position(to_square)))
+            keys.add(game.zobrist_key)
+        assert len(keys) == 40
+
+        # Only 7 first moves exist
+        assert len(get_distinct_openings(random.Random(0), 7, 1)) == 7
+        with self.assertRaises(ValueError):
+            get_distinct_openings(random.Random(0), 8, 1)
+
+    def test_play_game_max_moves(self):
+        winner, move_ms, move_counts = play_game(PlayerConfig("a"), PlayerConfig("b"), [], 2)
+        assert winner is None
+        assert move_counts == {Side.BLACK: 1, Side.WHITE: 1}
+
+    def test_run_swaps_colors(self):
+        first, second = PlayerConfig("depth", depth=1), PlayerConfig("heuristic")
+        result = Tournament(workers=2).run(first, second, 3, max_moves=20)
+        assert result.games == 4
+        assert result.first_moves > 0 and result.second_moves > 0
+
+    def test_elo(self):
+        result = TournamentResult(PlayerConfig("a"), PlayerConfig("b"), wins=30, draws=40, losses=30)
+        assert result.score == 0.5
+        assert result.elo == 0
+        assert 0 < result.elo_error < 100
+
+        result = TournamentResult(PlayerConfig("a"), PlayerConfig("b"), wins=3, draws=1, losses=0)
+        assert round(result.elo) == round(-400 * math.log10(1 / 0.875 - 1))
+        assert TournamentResult(PlayerConfig("a"), PlayerConfig("b"), wins=2).elo == math.inf
+
+
+if __name__ == '__main__':
+    unittest.main()
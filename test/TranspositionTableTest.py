@@ -0,0 +1,47 @@
+import unittest
+
+from src.model import TranspositionTable
+from src.model.dataclasses import Bound, Position
+
+
+class TranspositionTableTest(unittest.TestCase):
+    def test_memory_cap(self):
+        table = TranspositionTable(memory_bytes=100_000)
+        assert table.capacity * TranspositionTable.ENTRY_SIZE_BYTES <= 100_000
+        assert table.capacity == 2 * 128
+
+    def test_store_and_probe(self):
+        table = TranspositionTable(memory_bytes=100_000)
+        move = (Position.at(2, 1), Position.at(3, 0))
+        table.store(12345, 3, 40, Bound.EXACT, move)
+        entry = table.probe(12345)
+        assert entry.depth == 3 and entry.score == 40 and entry.bound == Bound.EXACT and entry.best_move == move
+        assert table.probe(54321) is None
+        assert table.hits == 1 and table.misses == 1
+
+    def test_replacement_policy(self):
+        table = TranspositionTable(memory_bytes=TranspositionTable.ENTRY_SIZE_BYTES * 2)
+        assert table.capacity == 2
+        table.store(1, 5, 0, Bound.EXACT, None)
+        # Shallower entry goes to the always-replace slot
+        table.store(2, 1, 0, Bound.LOWER, None)
+        table.store(3, 2, 0, Bound.UPPER, None)
+        assert table.probe(1).depth == 5
+        assert table.probe(2) is None
+        assert table.probe(3).depth == 2
+        assert table.collisions == 1
+        # Deeper entry takes the depth-preferred slot
+        table.store(4, 6, 0, Bound.EXACT, None)
+        assert table.probe(1) is None
+        assert table.probe(4).depth == 6
+
+    def test_clear(self):
+        table = TranspositionTable(memory_bytes=100_000)
+        table.store(7, 1, 0, Bound.EXACT, None)
+        table.clear()
+        assert table.probe(7) is None
+        assert table.hits == 0 and table.misses == 1
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import random
+import unittest
+
+from src.model import Game, Zobrist
+from src.model.dataclasses import Position, Side
+
+
+def compute_key(game: Game) -> int:
+    pieces = game.board.get_pieces(Side.BLACK) + game.board.get_pieces(Side.WHITE)
+    return Zobrist.compute_key(pieces, game.side_to_move)
+
+
+class ZobristTest(unittest.TestCase):
+    def test_initial_key(self):
+        assert Game().zobrist_key == Game().zobrist_key
+        assert Game().zobrist_key == compute_key(Game())
+
+    def test_side_to_move(self):
+        game = Game()
+        key = game.zobrist_key
+        game.next_move()
+        assert game.zobrist_key != key
+        assert game.board.zobrist_key == key
+
+    def test_transposition(self):
+        game1 = Game()
+        game1.make(game1.get_valid_moves(game1.board.get_piece(Position(2, 1)))[Position(3, 0)])
+        game1.make(game1.get_valid_moves(game1.board.get_piece(Position(5, 0)))[Position(4, 1)])
+        game1.make(game1.get_valid_moves(game1.board.get_piece(Position(2, 3)))[Position(3, 4)])
+
+        game2 = Game()
+        game2.make(game2.get_valid_moves(game2.board.get_piece(Position(2, 3)))[Position(3, 4)])
+        game2.make(game2.get_valid_moves(game2.board.get_piece(Position(5, 0)))[Position(4, 1)])
+        game2.make(game2.get_valid_moves(game2.board.get_piece(Position(2, 1)))[Position(3, 0)])
+
+        assert game1.zobrist_key == game2.zobrist_key
+
+    def test_incremental_updates(self):
+        rng = random.Random(0)
+        game = Game()
+        keys = []
+        for _ in range(80):
+            moves = game.get_all_valid_moves(game.side_to_move)
+            if not moves:
+                break
+            keys.append(game.zobrist_key)
+            game.make(rng.choice(moves))
+            assert game.zobrist_key == compute_key(game)
+
+        while keys:
+            game.unmake()
+            assert game.zobrist_key == keys.pop()
+
+
+if __name__ == '__main__':
+    unittest.main()